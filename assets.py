@@ -0,0 +1,207 @@
+import io
+import json
+import mmap
+import os
+import struct
+import threading
+
+import pygame
+
+# Pre-scaled sprites and sounds packed by `python fix_sprites.py`
+BUNDLE_PATH = 'assets.bundle'
+BUNDLE_MAGIC = b'SIAB'
+BUNDLE_VERSION = 1
+# magic, version, index length; the JSON index follows, then the data blobs
+BUNDLE_HEADER = struct.Struct('<4sHI')
+
+
+def sprite_key(path, size):
+    return f'{path}@{size[0]}x{size[1]}' if size else path
+
+
+def source_stamp(path):
+    """(size, mtime) of a source file, used to spot a stale bundle entry."""
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def convert_if_display(surface, alpha):
+    """Return `surface` in the display's pixel format, with per-pixel alpha if `alpha`.
+
+    convert() and convert_alpha() need a display mode, so without one (as
+    in headless tools) the surface is returned unchanged.
+    """
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+class AssetBundle:
+    """Read-only view of an asset bundle, memory-mapped in one go.
+
+    Sprites are stored as raw RGBA pixels at their final size and sounds as
+    WAV files. An entry is only served while its source file is unchanged
+    since the bundle was built; otherwise callers fall back to the source.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_length = BUNDLE_HEADER.unpack_from(self._data)
+        if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+            raise ValueError(f'{path} is not an asset bundle (or an unsupported version)')
+        start = BUNDLE_HEADER.size
+        self.index = json.loads(bytes(self._data[start:start + index_length]))
+        self._fresh = {}
+
+    @classmethod
+    def open(cls, path=BUNDLE_PATH):
+        """Return the bundle at `path`, or None if it is missing or unreadable."""
+        try:
+            return cls(path)
+        except (OSError, ValueError, struct.error):
+            return None
+
+    def _entry(self, key):
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+        fresh = self._fresh.get(key)
+        if fresh is None:
+            try:
+                fresh = source_stamp(entry['source']) == entry['stamp']
+            except OSError:
+                fresh = True  # source removed; the bundle is all we have
+            self._fresh[key] = fresh
+        return entry if fresh else None
+
+    def blob(self, key):
+        entry = self._entry(key)
+        if entry is None:
+            return None
+        return memoryview(self._data)[entry['offset']:entry['offset'] + entry['length']]
+
+    def has_sprites(self, path):
+        """True if every bundled size of `path` is fresh (so decoding it can be skipped)."""
+        keys = [key for key, entry in self.index.items() if entry['source'] == path and entry['kind'] == 'sprite']
+        return bool(keys) and all(self._entry(key) for key in keys)
+
+    def sprite(self, path, size):
+        data = self.blob(sprite_key(path, size))
+        if data is None:
+            return None
+        # Copy out of the mapping so the bundle can be closed independently
+        return pygame.image.frombuffer(bytes(data), tuple(self.index[sprite_key(path, size)]['size']), 'RGBA')
+
+    def sound(self, path):
+        data = self.blob(path)
+        if data is None:
+            return None
+        return pygame.mixer.Sound(file=io.BytesIO(data))
+
+    def close(self):
+        self._data.close()
+
+
+class SpriteCache:
+    """Decode each sprite once and hand out shared, scaled surfaces.
+
+    Surfaces are cached by (path, size). The decoded source image is kept
+    separately, so asking for the same file at two sizes (the ship and its
+    life icon) still reads the PNG from disk only once. When an asset bundle
+    is available, pre-scaled sprites come from it and no PNG is decoded.
+
+    The bundle at `bundle_path` is mapped on first use rather than when the
+    cache is created, and close_bundle() unmaps it again, so importing this
+    module does not hold the file open.
+    """
+
+    def __init__(self, bundle_path=None):
+        self.bundle_path = bundle_path
+        self._bundle = None
+        self._bundle_opened = bundle_path is None
+        self._bundle_lock = threading.Lock()  # the loader thread may be first to ask
+        self._images = {}    # path -> decoded, unscaled surface
+        self._surfaces = {}  # (path, size) -> scaled, converted surface
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def bundle(self):
+        """The mapped AssetBundle, or None if there is none."""
+        if not self._bundle_opened:
+            with self._bundle_lock:
+                if not self._bundle_opened:
+                    self._bundle = AssetBundle.open(self.bundle_path)
+                    self._bundle_opened = True
+        return self._bundle
+
+    def close_bundle(self):
+        """Unmap the bundle, e.g. before replacing the file; it is reopened on next use."""
+        with self._bundle_lock:
+            if self._bundle is not None:
+                self._bundle.close()
+            self._bundle = None
+            self._bundle_opened = self.bundle_path is None
+
+    def get(self, path, size=None):
+        key = (path, size)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        bundle = self.bundle
+        surface = bundle.sprite(path, size) if bundle else None
+        if surface is None:
+            image = self._images.get(path)
+            if image is None:
+                self.preload(path, force=True)
+                image = self._images[path]
+            surface = pygame.transform.scale(image, size) if size else image.copy()
+        surface = convert_if_display(surface, alpha=True)
+        self._surfaces[key] = surface
+        return surface
+
+    def preload(self, path, force=False):
+        """Decode `path` without scaling it; safe to call from a loader thread.
+
+        Skipped when the bundle already holds every size of the sprite,
+        unless `force` is set.
+        """
+        if path in self._images:
+            return
+        bundle = None if force else self.bundle
+        if bundle and bundle.has_sprites(path):
+            return
+        self._images[path] = pygame.image.load(path)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._surfaces)}
+
+    def shared_memo(self):
+        """Return a copy.deepcopy memo that keeps cached surfaces shared."""
+        return {id(surface): surface for surface in self._surfaces.values()}
+
+    def clear(self):
+        self._images.clear()
+        self._surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# Shared cache used by every entity and screen
+sprites = SpriteCache(BUNDLE_PATH)
+
+
+def load_sprite(path, size=None):
+    """Return the shared surface for `path` scaled to `size`."""
+    return sprites.get(path, size)
+
+
+def load_sound(path):
+    """Return a new pygame.mixer.Sound for `path`, from the bundle when possible."""
+    bundle = sprites.bundle
+    sound = bundle.sound(path) if bundle else None
+    return sound if sound is not None else pygame.mixer.Sound(path)
@@ -0,0 +1,46 @@
+import pygame
+
+from assets import convert_if_display, load_sprite
+
+
+class SpriteAtlas:
+    """All sprite frames pre-scaled and packed into one surface.
+
+    `frames` maps a name to the (path, size) it is drawn at. Frames are
+    placed on shelves, tallest first, and addressed by name. A frame is
+    drawn by blitting an area of the atlas, so many sprites can go out in
+    one Surface.blits() call instead of one blit() each.
+    """
+
+    def __init__(self, frames, max_width=512, padding=1):
+        self.regions = {}
+        placed = []
+        x = y = shelf_height = width = 0
+        for name, (path, size) in sorted(frames.items(), key=lambda item: -item[1][1][1]):
+            image = load_sprite(path, size)
+            w, h = image.get_size()
+            if x + w > max_width:
+                x = 0
+                y += shelf_height + padding
+                shelf_height = 0
+            self.regions[name] = pygame.Rect(x, y, w, h)
+            placed.append((image, (x, y)))
+            x += w + padding
+            width = max(width, x)
+            shelf_height = max(shelf_height, h)
+
+        self.surface = pygame.Surface((width, y + shelf_height), pygame.SRCALPHA)
+        self.surface.blits(placed, doreturn=False)
+        self.surface = convert_if_display(self.surface, alpha=True)
+
+    def region(self, name):
+        return self.regions[name]
+
+    def blit(self, target, name, position):
+        return target.blit(self.surface, position, self.regions[name])
+
+    def blits(self, target, name, positions):
+        """Draw frame `name` at every position in one call and return the rects."""
+        surface = self.surface
+        area = self.regions[name]
+        return target.blits([(surface, position, area) for position in positions])
@@ -0,0 +1,167 @@
+"""Play thousands of seeded headless games across all CPU cores.
+
+Used for balance tuning: sweep a grid of GameConfig settings, play a number
+of games per setting with a scripted or random policy, and aggregate win
+rate, score, game length and how each game ended:
+
+    python batch.py --games 1000 --grid enemy_shoot_prob=0.005,0.01,0.02 --grid enemy_speed=1,2
+
+Each game is an independent job, so throughput scales with the number of
+worker processes until every core is busy.
+"""
+import argparse
+import csv
+import itertools
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+import headless  # noqa: F401 (selects the SDL dummy drivers before pygame starts)
+from headless import idle_policy, sweeping_policy
+from space_invaders import GameConfig, GameState, INPUT_FIRE, INPUT_LEFT, INPUT_RIGHT
+
+# Games that run this long without ending are counted as timeouts
+DEFAULT_MAX_FRAMES = 36000  # ten minutes at 60 FPS
+
+END_REASONS = ('cleared', 'shot', 'invaded', 'timeout')
+
+
+def make_policy(name, seed):
+    if name == 'idle':
+        return idle_policy
+    if name == 'sweep':
+        return sweeping_policy
+    if name == 'random':
+        # Separate stream from the game's own RNG so both stay reproducible
+        rng = random.Random(seed ^ 0x5EED)
+        choices = (0, INPUT_LEFT, INPUT_RIGHT, INPUT_FIRE, INPUT_LEFT | INPUT_FIRE, INPUT_RIGHT | INPUT_FIRE)
+        return lambda state: rng.choice(choices)
+    raise ValueError(f'unknown policy: {name}')
+
+
+def play_game(job):
+    """Play one game; `job` is (config_index, settings, seed, policy, max_frames, rows, cols)."""
+    config_index, settings, seed, policy_name, max_frames, rows, cols = job
+    state = GameState(rows, cols, seed=seed, config=GameConfig(**settings))
+    policy = make_policy(policy_name, seed)
+    step = state.step
+    while not state.game_over and state.frame < max_frames:
+        step(policy(state))
+    return config_index, {
+        'seed': seed,
+        'score': state.score,
+        'frames': state.frame,
+        'end_reason': state.end_reason or 'timeout',
+    }
+
+
+def config_grid(grid, base=None):
+    """Expand {setting: [values]} into a list of GameConfigs, one per combination."""
+    base = base or GameConfig()
+    names = list(grid)
+    return [base.replace(**dict(zip(names, values))) for values in itertools.product(*(grid[n] for n in names))]
+
+
+class Summary:
+    def __init__(self, config):
+        self.config = config
+        self.games = 0
+        self.wins = 0
+        self.total_score = 0
+        self.total_frames = 0
+        self.end_reasons = dict.fromkeys(END_REASONS, 0)
+
+    def add(self, result):
+        self.games += 1
+        self.wins += result['end_reason'] == 'cleared'
+        self.total_score += result['score']
+        self.total_frames += result['frames']
+        self.end_reasons[result['end_reason']] += 1
+
+    def row(self, names):
+        games = max(self.games, 1)
+        row = {name: getattr(self.config, name) for name in names}
+        row.update({
+            'games': self.games,
+            'win_rate': self.wins / games,
+            'avg_score': self.total_score / games,
+            'avg_frames': self.total_frames / games,
+        })
+        row.update({f'ended_{reason}': self.end_reasons[reason] for reason in END_REASONS})
+        return row
+
+
+def run_batch(configs, games_per_config, policy='random', max_frames=DEFAULT_MAX_FRAMES, processes=None,
+              base_seed=0, rows=5, cols=10):
+    """Play `games_per_config` games for each config and return one Summary per config.
+
+    Game `i` of every config uses seed base_seed + i, so configurations are
+    compared on the same sequence of seeds.
+    """
+    jobs = [(index, config.as_dict(), base_seed + game, policy, max_frames, rows, cols)
+            for index, config in enumerate(configs) for game in range(games_per_config)]
+    summaries = [Summary(config) for config in configs]
+    processes = processes or os.cpu_count() or 1
+    # Several chunks per worker keeps every core busy until the end
+    chunksize = max(1, len(jobs) // (processes * 8))
+    if processes == 1:
+        results = map(play_game, jobs)
+        for index, result in results:
+            summaries[index].add(result)
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            for index, result in pool.imap_unordered(play_game, jobs, chunksize):
+                summaries[index].add(result)
+    return summaries
+
+
+def parse_grid(specs):
+    grid = {}
+    for spec in specs:
+        name, _, values = spec.partition('=')
+        if name not in GameConfig.FIELDS:
+            raise SystemExit(f'unknown setting {name!r}; choose from {", ".join(GameConfig.FIELDS)}')
+        grid[name] = [float(v) if any(c in v for c in '.e') else int(v) for v in values.split(',')]
+    return grid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run seeded headless games in parallel for balance tuning')
+    parser.add_argument('--grid', action='append', default=[], metavar='SETTING=V1,V2,...',
+                        help='sweep a GameConfig setting over these values (repeatable)')
+    parser.add_argument('--games', type=int, default=200, help='games per configuration')
+    parser.add_argument('--policy', choices=('random', 'sweep', 'idle'), default='random')
+    parser.add_argument('--max-frames', type=int, default=DEFAULT_MAX_FRAMES)
+    parser.add_argument('--processes', type=int, default=None, help='worker processes (default: all cores)')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first game')
+    parser.add_argument('--csv', metavar='PATH', help='also write the results table to a CSV file')
+    args = parser.parse_args(argv)
+
+    grid = parse_grid(args.grid)
+    configs = config_grid(grid)
+    start = time.perf_counter()
+    summaries = run_batch(configs, args.games, args.policy, args.max_frames, args.processes, args.seed)
+    elapsed = time.perf_counter() - start
+
+    names = list(grid)
+    rows = [summary.row(names) for summary in summaries]
+    columns = list(rows[0])
+    print('  '.join(f'{c:>14}' for c in columns))
+    for row in rows:
+        print('  '.join(f'{v:>14.3f}' if isinstance(v, float) else f'{v:>14}' for v in row.values()))
+    total = sum(s.games for s in summaries)
+    frames = sum(s.total_frames for s in summaries)
+    print(f'{total} games, {frames} frames in {elapsed:.1f}s ({frames / elapsed:.0f} frames/sec)')
+
+    if args.csv:
+        with open(args.csv, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
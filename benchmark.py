@@ -0,0 +1,193 @@
+"""Reproducible benchmarks for the game loop.
+
+Each scenario drives GameState headless with a fixed seed and a scripted
+policy, drawing every frame as main() does. It reports steps/sec, frame-time
+percentiles and peak traced memory. Results are saved as JSON and can be
+compared against a stored baseline:
+
+    python benchmark.py                                  # run, save results
+    python benchmark.py --save-baseline                  # record a new baseline
+    python benchmark.py --baseline bench_baseline.json   # fail on regressions
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import headless  # noqa: F401 (selects the SDL dummy drivers before pygame starts)
+import pygame
+import space_invaders
+from headless import sweeping_policy
+from screens import IdleScreen
+from space_invaders import GameConfig, GameState, INPUT_FIRE, draw_scene, game_over_frame
+from leaderboard import DEFAULT_SCORES, SQLiteLeaderboard
+
+
+def double_shot_policy(state):
+    # Keep the power-up active for the whole run
+    state.spaceship.double_shot = True
+    state.spaceship.power_up_timer = state.config.powerup_duration
+    return sweeping_policy(state) | INPUT_FIRE
+
+
+class Scenario:
+    def __init__(self, name, frames, policy=sweeping_policy, rows=5, cols=10, config=None,
+                 game_over_screen=False):
+        self.name = name
+        self.frames = frames
+        self.policy = policy
+        self.rows = rows
+        self.cols = cols
+        self.config = config or GameConfig()
+        self.game_over_screen = game_over_screen
+
+
+SCENARIOS = [
+    Scenario('default_wave', 3000),
+    # The largest wave that fits above the ship, held in place so it stays
+    # alive (and on screen) for the whole run
+    Scenario('stress_wave_12x15', 600, rows=12, cols=15, config=GameConfig(enemy_drop=0)),
+    Scenario('double_shot', 3000, policy=double_shot_policy),
+    Scenario('bullet_hell', 3000, config=GameConfig(enemy_shoot_prob=0.5, ufo_shoot_prob=0.1)),
+    # One redraw of the game-over screen per blink of its prompt
+    Scenario('game_over_blink', 3000, game_over_screen=True),
+]
+
+
+class Runner:
+    def __init__(self, seed=1234):
+        self.seed = seed
+        self.screen = space_invaders.init_display()
+        self.font = pygame.font.SysFont(None, 36)
+        self.leaderboard = SQLiteLeaderboard(':memory:')
+        self.leaderboard.add_many((entry['name'], entry['score']) for entry in DEFAULT_SCORES)
+
+    def _new_state(self, scenario):
+        state = GameState(scenario.rows, scenario.cols, seed=self.seed, config=scenario.config)
+        if scenario.game_over_screen:
+            state.game_over = True
+        return state
+
+    def _frames(self, scenario, frames):
+        """Yield once per simulated and drawn frame."""
+        state = self._new_state(scenario)
+        if scenario.game_over_screen:
+            # Same draw callback and redraw as show_game_over_screen(),
+            # without waiting out the blink interval in between
+            draw = game_over_frame(state, self.font, self.leaderboard.scores())
+            idle = IdleScreen(self.screen, draw, None)
+            for _ in range(frames):
+                idle.redraw()
+                idle.tick += 1
+                yield
+            return
+        for _ in range(frames):
+            state.step(scenario.policy(state))
+            if state.game_over:
+                state = self._new_state(scenario)
+            draw_scene(self.screen, state, self.font)
+            pygame.display.flip()
+            yield
+
+    def run(self, scenario):
+        times = np.empty(scenario.frames)
+        clock = time.perf_counter
+        start = last = clock()
+        for i, _ in enumerate(self._frames(scenario, scenario.frames)):
+            now = clock()
+            times[i] = now - last
+            last = now
+        elapsed = last - start
+
+        # Separate, shorter pass for memory: tracing slows everything down
+        tracemalloc.start()
+        for _ in self._frames(scenario, min(scenario.frames, 600)):
+            pass
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        p50, p95, p99 = np.percentile(times * 1000.0, (50, 95, 99))
+        return {
+            'frames': scenario.frames,
+            'steps_per_sec': scenario.frames / elapsed,
+            'frame_ms': {'p50': p50, 'p95': p95, 'p99': p99, 'max': float(times.max() * 1000.0)},
+            'peak_memory_kb': peak / 1024.0,
+        }
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'system': platform.system(),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of regression messages against a baseline."""
+    regressions = []
+    for name, result in results['scenarios'].items():
+        base = baseline.get('scenarios', {}).get(name)
+        if base is None:
+            continue
+        if result['steps_per_sec'] < base['steps_per_sec'] * (1 - tolerance):
+            regressions.append(f"{name}: {result['steps_per_sec']:.0f} steps/sec, "
+                               f"baseline {base['steps_per_sec']:.0f}")
+        if result['frame_ms']['p99'] > base['frame_ms']['p99'] * (1 + tolerance):
+            regressions.append(f"{name}: p99 {result['frame_ms']['p99']:.3f} ms, "
+                               f"baseline {base['frame_ms']['p99']:.3f} ms")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the Space Invaders game loop headless')
+    parser.add_argument('--scenario', action='append', choices=[s.name for s in SCENARIOS],
+                        help='run only this scenario (repeatable)')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', default='bench_results.json', help='where to save the results')
+    parser.add_argument('--baseline', default='bench_baseline.json', help='baseline results to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='also save the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help='allowed slowdown before a result counts as a regression (default 10%%)')
+    args = parser.parse_args(argv)
+
+    runner = Runner(seed=args.seed)
+    results = {'seed': args.seed, 'environment': environment(), 'scenarios': {}}
+    print(f"{'scenario':<20} {'steps/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'peak KiB':>9}")
+    for scenario in SCENARIOS:
+        if args.scenario and scenario.name not in args.scenario:
+            continue
+        result = runner.run(scenario)
+        results['scenarios'][scenario.name] = result
+        ms = result['frame_ms']
+        print(f"{scenario.name:<20} {result['steps_per_sec']:9.0f} {ms['p50']:8.3f} {ms['p95']:8.3f} "
+              f"{ms['p99']:8.3f} {result['peak_memory_kb']:9.0f}")
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f'Saved baseline to {args.baseline}')
+        return 0
+
+    try:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        print(f'No baseline at {args.baseline}; run with --save-baseline to create one')
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    for message in regressions:
+        print(f'REGRESSION {message}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,156 @@
+import numpy as np
+import pygame
+
+from assets import convert_if_display
+from colors import Colors
+
+BUNKER_COUNT = 4
+BUNKER_WIDTH = 66
+BUNKER_HEIGHT = 48
+BUNKER_COLOR = Colors.GREEN
+CRATER_RADIUS = 5
+
+
+def bunker_shape(width=BUNKER_WIDTH, height=BUNKER_HEIGHT):
+    """Classic bunker outline as a (width, height) bool array: bevelled top, arch cut out below."""
+    x, y = np.meshgrid(np.arange(width), np.arange(height), indexing='ij')
+    bevel = height // 4
+    shape = (x + y >= bevel) & ((width - 1 - x) + y >= bevel)
+    # Arch: a rectangle under a half-ellipse, centred on the bottom edge
+    arch_half_width = width // 6
+    arch_top = height * 2 // 3
+    cx = (width - 1) / 2.0
+    in_arch = np.abs(x - cx) <= arch_half_width
+    dome = ((x - cx) / arch_half_width) ** 2 + ((y - arch_top) / (arch_half_width * 0.8)) ** 2 <= 1.0
+    shape &= ~(in_arch & ((y >= arch_top) | dome))
+    return shape
+
+
+def crater(radius=CRATER_RADIUS):
+    """Ragged blast stamp: a disc with every other rim pixel kept, so hits leave a rough edge."""
+    x, y = np.meshgrid(np.arange(-radius, radius + 1), np.arange(-radius, radius + 1), indexing='ij')
+    distance = x * x + y * y
+    rim = (distance > (radius - 1) ** 2) & ((x + y) % 2 == 0)
+    return (distance <= radius * radius) & ~rim
+
+
+class Bunkers:
+    """Destructible shields whose pixels live in one boolean bitmap.
+
+    The bitmap covers a horizontal band of the screen and is indexed
+    [x, y] like pygame.surfarray. Impacts clear a crater stamp with one
+    vectorized operation, and only the part of the band that changed is
+    uploaded to the cached surface before it is next drawn.
+
+    Hit tests read `columns`, the bitmap packed into one int per x with bit
+    y set for each solid pixel. It is repacked for the columns a stamp
+    touched, so a test is an OR of a few ints rather than a NumPy slice.
+    """
+
+    def __init__(self, screen_width, top, count=BUNKER_COUNT):
+        self.rect = pygame.Rect(0, top, screen_width, BUNKER_HEIGHT)
+        self.bitmap = np.zeros((screen_width, BUNKER_HEIGHT), dtype=bool)
+        spacing = screen_width / count
+        shape = bunker_shape()
+        self.bunker_rects = []
+        for i in range(count):
+            left = int(spacing * (i + 0.5)) - BUNKER_WIDTH // 2
+            self.bitmap[left:left + BUNKER_WIDTH] = shape
+            self.bunker_rects.append(pygame.Rect(left, top, BUNKER_WIDTH, BUNKER_HEIGHT))
+        self.columns = [0] * screen_width
+        self._pack_columns(0, screen_width)
+        self._crater = crater()
+        self._surface = None
+        self._dirty = self.rect.copy()  # band area not yet uploaded, screen coordinates
+        self.version = 0  # bumped whenever the bitmap changes
+
+    def __getstate__(self):
+        # The cached surface is rendering state; snapshots rebuild it on demand
+        state = self.__dict__.copy()
+        state['_surface'] = None
+        state['_dirty'] = self.rect.copy()
+        return state
+
+    def _pack_columns(self, left, right):
+        packed = np.packbits(self.bitmap[left:right], axis=1, bitorder='little')
+        columns = self.columns
+        for x, column in enumerate(packed, left):
+            columns[x] = int.from_bytes(column.tobytes(), 'little')
+
+    def _impact(self, rect, from_below):
+        # Rect prefilter against the bunker boxes before touching the bitmap
+        if rect.collidelist(self.bunker_rects) < 0:
+            return None
+        band = self.rect
+        left = max(rect.left, band.left) - band.left
+        right = min(rect.right, band.right) - band.left
+        top = max(rect.top, band.top) - band.top
+        bottom = min(rect.bottom, band.bottom) - band.top
+        bits = 0
+        for column in self.columns[left:right]:
+            bits |= column
+        bits &= ((1 << (bottom - top)) - 1) << top
+        if not bits:
+            return None
+        # The first solid row the bullet meets along its direction of travel
+        row = bits.bit_length() - 1 if from_below else (bits & -bits).bit_length() - 1
+        return band.left + (left + right) // 2, band.top + row
+
+    def hit_from_below(self, rect):
+        """Impact point of an upward-moving bullet, or None if it hits nothing."""
+        return self._impact(rect, True)
+
+    def hit_from_above(self, rect):
+        """Impact point of a downward-moving bullet, or None if it hits nothing."""
+        return self._impact(rect, False)
+
+    def erode(self, x, y):
+        """Clear a crater centred on screen point (x, y)."""
+        r = CRATER_RADIUS
+        self._clear(x - r, y - r, self._crater)
+
+    def erase(self, x, y, width, height):
+        """Clear every bunker pixel under a screen rect, e.g. an enemy passing through."""
+        self._clear(int(x), int(y), None, width, height)
+
+    def _clear(self, x, y, stamp, width=None, height=None):
+        if stamp is not None:
+            width, height = stamp.shape
+        region = pygame.Rect(x, y, width, height).clip(self.rect)
+        if not region.width or not region.height:
+            return
+        band = self.rect
+        target = self.bitmap[region.left - band.left:region.right - band.left,
+                             region.top - band.top:region.bottom - band.top]
+        # Erasing already empty cells (enemies sweeping the band every step)
+        # changes nothing, so keep the version and the cached surface as is
+        if not target.any():
+            return
+        if stamp is None:
+            target[...] = False
+        else:
+            target &= ~stamp[region.left - x:region.right - x, region.top - y:region.bottom - y]
+        self._pack_columns(region.left - band.left, region.right - band.left)
+        self.version += 1
+        self._dirty = self._dirty.union(region) if self._dirty else region
+
+    def _upload(self):
+        if self._surface is None:
+            surface = convert_if_display(pygame.Surface(self.rect.size), alpha=False)
+            surface.set_colorkey(Colors.BLACK)
+            self._surface = surface
+        band = self.rect
+        dirty = self._dirty.move(-band.left, -band.top)
+        pixels = self.bitmap[dirty.left:dirty.right, dirty.top:dirty.bottom]
+        rgb = np.zeros(pixels.shape + (3,), dtype=np.uint8)
+        rgb[pixels] = BUNKER_COLOR
+        pygame.surfarray.blit_array(self._surface.subsurface(dirty), rgb)
+        self._dirty = None
+
+    def draw(self, surface):
+        """Blit the bunkers, uploading changed pixels first; returns the rects drawn."""
+        if self._dirty:
+            self._upload()
+        band = self.rect
+        cache = self._surface
+        return surface.blits([(cache, rect, rect.move(-band.left, -band.top)) for rect in self.bunker_rects])
@@ -0,0 +1,69 @@
+import pygame
+
+from assets import load_sprite
+
+
+class MaskCache:
+    """One pygame.mask.Mask per sprite frame, built on first use.
+
+    Masks are keyed like the sprite cache, by (path, size), so each
+    animation frame at each scale gets its own mask. Solid rectangles (the
+    bullets) get a filled mask per size.
+    """
+
+    def __init__(self):
+        self._masks = {}
+
+    def get(self, path, size):
+        key = (path, size)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = pygame.mask.from_surface(load_sprite(path, size))
+            self._masks[key] = mask
+        return mask
+
+    def solid(self, size):
+        key = ('solid', size)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = pygame.mask.Mask(size, fill=True)
+            self._masks[key] = mask
+        return mask
+
+    def clear(self):
+        self._masks.clear()
+
+
+# Shared cache; masks never change once built
+masks = MaskCache()
+
+
+class NarrowPhase:
+    """Pixel-accurate overlap tests, run only after a rect test has passed.
+
+    `frames` maps a sprite frame name, e.g. 'enemy_up', to its (path, size),
+    as for the sprite atlas. `tests` counts the mask tests run since the last `begin_frame()`;
+    `total` and `frames` accumulate over the whole game.
+    """
+
+    def __init__(self, frames):
+        self.sprite_frames = frames
+        self.tests = 0
+        self.total = 0
+        self.frames = 0
+
+    def begin_frame(self):
+        self.total += self.tests
+        self.frames += 1
+        self.tests = 0
+
+    def rect_overlaps(self, rect, frame, x, y):
+        """True if solid `rect` touches an opaque pixel of `frame` drawn at (x, y)."""
+        self.tests += 1
+        # Sprites are blitted at truncated coordinates; match that here
+        offset = (rect.x - int(x), rect.y - int(y))
+        return masks.get(*self.sprite_frames[frame]).overlap(masks.solid(rect.size), offset) is not None
+
+    def mean_tests(self):
+        """Average mask tests per frame so far."""
+        return (self.total + self.tests) / self.frames if self.frames else 0.0
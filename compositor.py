@@ -0,0 +1,78 @@
+import pygame
+
+from assets import convert_if_display
+
+# Default layers, bottom to top
+LAYERS = ('background', 'formation', 'projectiles', 'hud', 'overlay')
+
+
+class Layer:
+    __slots__ = ('name', 'rect', 'opaque', 'surface', 'key', 'visible')
+
+    def __init__(self, name, rect, opaque=False):
+        self.name = name
+        self.opaque = opaque
+        self.key = None
+        self.visible = True
+        self.resize(rect)
+
+    def resize(self, rect):
+        self.rect = pygame.Rect(rect)
+        if self.opaque:
+            surface = pygame.Surface(self.rect.size)
+        else:
+            surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.surface = convert_if_display(surface, alpha=not self.opaque)
+        self.key = None
+
+
+class Compositor:
+    """Named layers, each a cached surface composited bottom to top.
+
+    A layer is rebuilt by `update(name, key, render)` only when `key`
+    differs from the key it was last built with, so static screens such as
+    menus and overlays are drawn once and then just blitted. The background
+    layer is opaque; the others keep per-pixel alpha.
+    """
+
+    def __init__(self, size, names=LAYERS):
+        self.rect = pygame.Rect((0, 0), size)
+        self.layers = {name: Layer(name, self.rect, opaque=(name == 'background')) for name in names}
+        self.rebuilds = 0
+
+    def layer(self, name):
+        return self.layers[name]
+
+    def update(self, name, key, render, rect=None):
+        """Rebuild layer `name` with render(surface) unless it was built with `key`.
+
+        `rect` places and sizes the layer on screen (the whole screen by
+        default); render() draws in the layer's own coordinates.
+        """
+        layer = self.layers[name]
+        if rect is not None and pygame.Rect(rect) != layer.rect:
+            layer.resize(rect)
+        if layer.key is not None and layer.key == key:
+            return layer.surface
+        layer.surface.fill((0, 0, 0) if layer.opaque else (0, 0, 0, 0))
+        render(layer.surface)
+        layer.key = key
+        self.rebuilds += 1
+        return layer.surface
+
+    def invalidate(self, name=None):
+        """Force `name` (or every layer) to be rebuilt on its next update."""
+        for layer in ([self.layers[name]] if name else self.layers.values()):
+            layer.key = None
+
+    def set_visible(self, name, visible):
+        self.layers[name].visible = visible
+
+    def compose(self, target, names=None):
+        """Blit the built, visible layers onto `target` and return the rects drawn."""
+        drawn = []
+        for name in names or self.layers:
+            layer = self.layers[name]
+            if layer.visible and layer.key is not None:
+                drawn.append(target.blit(layer.surface, layer.rect))
+        return drawn
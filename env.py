@@ -0,0 +1,210 @@
+"""Gym-style environments for training agents against the game.
+
+SpaceInvadersEnv wraps one headless GameState with reset()/step(action).
+Observations are NumPy arrays read straight from the entity state, or
+optionally a downsampled RGB frame. SpaceInvadersVecEnv steps N games in
+lockstep and returns batched arrays, resetting each game as it ends.
+
+Actions are indexes into ACTIONS: noop, left, right, fire, left+fire and
+right+fire. The reward is the score gained during the step.
+"""
+import numpy as np
+
+import headless  # noqa: F401 (selects the SDL dummy drivers before pygame starts)
+import pygame
+from bunkers import BUNKER_HEIGHT
+from space_invaders import (GameState, INPUT_FIRE, INPUT_LEFT, INPUT_RIGHT, MAX_ENEMY_BULLETS,
+                            MAX_PLAYER_BULLETS, SCREEN_HEIGHT, SCREEN_WIDTH, draw_scene)
+
+ACTIONS = (0, INPUT_LEFT, INPUT_RIGHT, INPUT_FIRE, INPUT_LEFT | INPUT_FIRE, INPUT_RIGHT | INPUT_FIRE)
+
+# Episodes longer than this are truncated
+DEFAULT_MAX_FRAMES = 36000
+
+# Bunker occupancy is observed in square cells of this many pixels
+BUNKER_CELL = 8
+
+
+def observation_shapes(rows, cols, pixel_scale=None):
+    """Shapes of the arrays in an observation dict."""
+    if pixel_scale:
+        return {'pixels': (SCREEN_HEIGHT // pixel_scale, SCREEN_WIDTH // pixel_scale, 3)}
+    return {
+        'ship': (5,),                                # x, lives, double shot, shield, invulnerable
+        'enemies': (rows * cols, 3),                 # x, y, alive
+        'player_bullets': (MAX_PLAYER_BULLETS, 3),   # x, y, active
+        'enemy_bullets': (MAX_ENEMY_BULLETS, 3),     # x, y, active
+        'ufo': (3,),                                 # x, y, active
+        # Solid fraction of each cell of the bunker band, (row, column)
+        'bunkers': (BUNKER_HEIGHT // BUNKER_CELL, SCREEN_WIDTH // BUNKER_CELL),
+    }
+
+
+class SpaceInvadersEnv:
+    """One game behind a reset()/step(action) interface.
+
+    step() returns (observation, reward, terminated, truncated, info).
+    With pixel_scale=k the observation is {'pixels': uint8 array} holding the
+    rendered frame downsampled by k in each direction; otherwise it is a
+    dict of float32 arrays described by observation_shapes().
+    """
+
+    def __init__(self, rows=5, cols=10, config=None, max_frames=DEFAULT_MAX_FRAMES, frame_skip=1,
+                 pixel_scale=None):
+        self.rows = rows
+        self.cols = cols
+        self.config = config
+        self.max_frames = max_frames
+        self.frame_skip = frame_skip
+        self.pixel_scale = pixel_scale
+        self.action_count = len(ACTIONS)
+        self.shapes = observation_shapes(rows, cols, pixel_scale)
+        self.state = None
+        # Last bunker occupancy observed, and the bitmap version it came from
+        self._bunkers = None
+        self._bunker_version = None
+        self._bunker_cells = np.zeros(self.shapes['bunkers'], dtype=np.float32) if 'bunkers' in self.shapes else None
+        if pixel_scale:
+            pygame.font.init()
+            self._canvas = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            self._font = pygame.font.SysFont(None, 36)
+
+    def reset(self, seed=None):
+        self.state = GameState(self.rows, self.cols, seed=seed, config=self.config)
+        return self.observe(), {'seed': self.state.seed}
+
+    def step(self, action):
+        reward, terminated, truncated, info = self.advance(action)
+        return self.observe(), reward, terminated, truncated, info
+
+    def advance(self, action):
+        """Play `action` for frame_skip frames without observing the result.
+
+        Returns (reward, terminated, truncated, info); step() and the
+        vectorized env both go through here.
+        """
+        state = self.state
+        inputs = ACTIONS[action]
+        score = state.score
+        for _ in range(self.frame_skip):
+            state.step(inputs)
+            if state.game_over:
+                break
+        terminated = state.game_over
+        truncated = not terminated and state.frame >= self.max_frames
+        info = {'frame': state.frame, 'score': state.score, 'end_reason': state.end_reason}
+        return state.score - score, terminated, truncated, info
+
+    def observe(self):
+        observation = {name: np.zeros(shape, dtype=np.uint8 if name == 'pixels' else np.float32)
+                       for name, shape in self.shapes.items()}
+        self.write_observation(observation)
+        return observation
+
+    def write_observation(self, out):
+        """Fill the preallocated arrays in `out` with the current observation."""
+        state = self.state
+        if self.pixel_scale:
+            draw_scene(self._canvas, state, self._font)
+            # surfarray is indexed (x, y); observations are (row, column, channel)
+            k = self.pixel_scale
+            pixels = pygame.surfarray.pixels3d(self._canvas)
+            out['pixels'][...] = pixels[::k, ::k].transpose(1, 0, 2)[:self.shapes['pixels'][0], :self.shapes['pixels'][1]]
+            del pixels  # release the surface lock
+            return
+
+        ship = state.spaceship
+        out['ship'][:] = (ship.x, ship.lives, ship.double_shot, ship.shield, ship.invulnerable)
+
+        formation = state.formation
+        enemies = out['enemies']
+        enemies[:, 0] = formation.x
+        enemies[:, 1] = formation.y
+        enemies[:, 2] = formation.alive
+
+        for name, pool in (('player_bullets', state.player_bullets), ('enemy_bullets', state.enemy_bullets)):
+            bullets = out[name]
+            bullets[:] = 0.0
+            for i, bullet in enumerate(pool):
+                bullets[i] = (bullet.x, bullet.y, 1.0)
+
+        ufo = state.ufo
+        out['ufo'][:] = (ufo.x, ufo.y, 1.0) if ufo else (0.0, 0.0, 0.0)
+
+        # Downsampling the band is the costly part, so it is redone only after a hit
+        bunkers = state.bunkers
+        if bunkers is not self._bunkers or bunkers.version != self._bunker_version:
+            # The bitmap is indexed [x, y]; sum each cell, then transpose to (row, column)
+            rows, columns = self.shapes['bunkers']
+            cells = bunkers.bitmap.reshape(columns, BUNKER_CELL, rows, BUNKER_CELL).sum(axis=(1, 3))
+            np.multiply(cells.T, 1.0 / (BUNKER_CELL * BUNKER_CELL), out=self._bunker_cells)
+            self._bunkers = bunkers
+            self._bunker_version = bunkers.version
+        out['bunkers'][...] = self._bunker_cells
+
+
+class SpaceInvadersVecEnv:
+    """N independent games stepped in lockstep with batched observations.
+
+    step(actions) takes one action per game and returns batched arrays:
+    observations of shape (N, ...), and rewards, terminated and truncated
+    of shape (N,). Games that end are reset straight away with the next
+    seed; their final info is kept in infos[i], and their last observation,
+    before the reset, in infos[i]['final_observation'].
+    """
+
+    def __init__(self, num_envs, seed=0, **env_kwargs):
+        self.envs = [SpaceInvadersEnv(**env_kwargs) for _ in range(num_envs)]
+        self.num_envs = num_envs
+        self.action_count = len(ACTIONS)
+        shapes = self.envs[0].shapes
+        self.observations = {name: np.zeros((num_envs,) + shape, dtype=np.uint8 if name == 'pixels' else np.float32)
+                             for name, shape in shapes.items()}
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.terminated = np.zeros(num_envs, dtype=bool)
+        self.truncated = np.zeros(num_envs, dtype=bool)
+        self._next_seed = seed
+
+    def _views(self, i):
+        return {name: batch[i] for name, batch in self.observations.items()}
+
+    def _reset_env(self, i):
+        env = self.envs[i]
+        env.reset(seed=self._next_seed)
+        self._next_seed += 1
+        env.write_observation(self._views(i))
+
+    def reset(self):
+        for i in range(self.num_envs):
+            self._reset_env(i)
+        return self.observations
+
+    def step(self, actions):
+        infos = []
+        for i, env in enumerate(self.envs):
+            reward, terminated, truncated, info = env.advance(actions[i])
+            self.rewards[i] = reward
+            self.terminated[i] = terminated
+            self.truncated[i] = truncated
+            infos.append(info)
+            if terminated or truncated:
+                # Kept for bootstrapping, as the batch slot is about to show the next game
+                info['final_observation'] = env.observe()
+                self._reset_env(i)
+            else:
+                env.write_observation(self._views(i))
+        return self.observations, self.rewards, self.terminated, self.truncated, infos
+
+
+if __name__ == '__main__':
+    import time
+
+    vec = SpaceInvadersVecEnv(16)
+    vec.reset()
+    rng = np.random.default_rng(0)
+    steps = 2000
+    start = time.perf_counter()
+    for _ in range(steps):
+        vec.step(rng.integers(0, vec.action_count, vec.num_envs))
+    elapsed = time.perf_counter() - start
+    print(f'{steps * vec.num_envs / elapsed:.0f} env steps/sec with {vec.num_envs} games')
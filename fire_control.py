@@ -0,0 +1,73 @@
+import math
+
+
+class FireControl:
+    """Decide when and from where the formation fires.
+
+    Only the front-line enemy of each column (its lowest alive one) may
+    shoot. The front line is updated when an enemy dies instead of being
+    rebuilt every frame, and the columns that still have a shooter are kept
+    in a list with swap-removal so one can be picked in O(1).
+
+    Rather than rolling `shoot_prob` every frame, the number of frames until
+    the next shot is drawn from the matching geometric distribution, so the
+    average rate is unchanged and a frame without a shot costs one decrement.
+    """
+
+    def __init__(self, formation, shoot_prob, rng):
+        self.formation = formation
+        self.shoot_prob = shoot_prob
+        self.rng = rng
+        rows, cols = formation.rows, formation.cols
+        alive = formation.alive
+        # front[col]: index of the column's lowest alive enemy, or -1
+        self.front = [-1] * cols
+        for col in range(cols):
+            for row in range(rows - 1, -1, -1):
+                if alive[row * cols + col]:
+                    self.front[col] = row * cols + col
+                    break
+        self.columns = [col for col in range(cols) if self.front[col] >= 0]
+        self._slot = [-1] * cols  # position of each column in self.columns
+        for slot, col in enumerate(self.columns):
+            self._slot[col] = slot
+        self.countdown = self._frames_until_shot()
+
+    def _frames_until_shot(self):
+        """Sample the frames until the next shot (1 = the next frame)."""
+        p = self.shoot_prob
+        if p <= 0.0:
+            return math.inf
+        if p >= 1.0:
+            return 1
+        return int(math.log(1.0 - self.rng.random()) / math.log1p(-p)) + 1
+
+    def on_kill(self, index):
+        """Update the front line after enemy `index` has been killed."""
+        cols = self.formation.cols
+        col = index % cols
+        if self.front[col] != index:
+            return
+        alive = self.formation.alive
+        for candidate in range(index - cols, -1, -cols):
+            if alive[candidate]:
+                self.front[col] = candidate
+                return
+        self.front[col] = -1
+        # Swap-remove the now empty column
+        slot = self._slot[col]
+        last = self.columns.pop()
+        if last != col:
+            self.columns[slot] = last
+            self._slot[last] = slot
+        self._slot[col] = -1
+
+    def tick(self):
+        """Advance one frame; return the index of the enemy that fires now, or None."""
+        self.countdown -= 1
+        if self.countdown > 0:
+            return None
+        self.countdown = self._frames_until_shot()
+        if not self.columns:
+            return None
+        return self.front[self.columns[self.rng.randrange(len(self.columns))]]
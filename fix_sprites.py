@@ -1,7 +1,37 @@
+"""Asset compiler: pre-scale every sprite and pack it, with the sounds, into one bundle.
+
+    python fix_sprites.py              # build or update assets.bundle
+    python fix_sprites.py --force      # rebuild every entry
+    python fix_sprites.py --strip-icc  # also strip ICC profiles from the PNGs first
+
+The bundle is a small header, a JSON index and the data blobs, each aligned
+to 16 bytes so the file can be memory-mapped and sliced without parsing.
+Sprites are stored as raw RGBA at the size the game draws them, so the game
+neither decodes nor scales a PNG at startup. Each entry records the content
+hash of its source; rebuilding only re-encodes inputs whose hash changed.
+"""
+import argparse
+import hashlib
+import json
 import os
-from PIL import Image
+
+import pygame
+
+from assets import (AssetBundle, BUNDLE_HEADER, BUNDLE_MAGIC, BUNDLE_PATH, BUNDLE_VERSION, source_stamp,
+                    sprite_key, sprites)
+from space_invaders import FRAMES, SCREEN_HEIGHT, SCREEN_WIDTH, SOUND_FILES
+
+ALIGNMENT = 16
+
+# Every (path, size) the game loads: the atlas frames plus the intro screen,
+# which screens.show_start_screen draws over the top 90% of the window
+SPRITE_TARGETS = sorted(set(FRAMES.values()) | {('sprites/IntroScreen.png', (SCREEN_WIDTH, int(SCREEN_HEIGHT * 0.9)))})
+SOUND_TARGETS = sorted(path for path, _ in SOUND_FILES.values())
+
 
 def remove_icc_profile(image_path):
+    from PIL import Image
+
     try:
         with Image.open(image_path) as img:
             # Re-save the image without the ICC profile
@@ -16,9 +46,90 @@ def process_sprites_folder(folder_path):
             image_path = os.path.join(folder_path, filename)
             remove_icc_profile(image_path)
 
+def content_hash(path, size=None):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        digest.update(f.read())
+    digest.update(f'{size}:{BUNDLE_VERSION}'.encode())
+    return digest.hexdigest()
+
+def encode_sprite(path, size):
+    # Same scaler as the runtime fallback, so bundled frames are pixel-identical
+    image = pygame.transform.scale(pygame.image.load(path), size)
+    return pygame.image.tostring(image, 'RGBA')
+
+def encode_sound(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def build_bundle(path=BUNDLE_PATH, force=False):
+    """Build or update the bundle at `path`; return (rebuilt, reused) entry counts."""
+    old = None if force else AssetBundle.open(path)
+    entries = []  # (key, entry, data)
+    rebuilt = reused = 0
+    targets = [(sprite_key(p, size), 'sprite', p, size) for p, size in SPRITE_TARGETS]
+    targets += [(p, 'sound', p, None) for p in SOUND_TARGETS]
+    for key, kind, source, size in targets:
+        digest = content_hash(source, size)
+        previous = old.index.get(key) if old else None
+        if previous is not None and previous['hash'] == digest:
+            data = bytes(old._data[previous['offset']:previous['offset'] + previous['length']])
+            reused += 1
+        else:
+            data = encode_sprite(source, size) if kind == 'sprite' else encode_sound(source)
+            rebuilt += 1
+        entry = {'kind': kind, 'source': source, 'hash': digest, 'stamp': source_stamp(source)}
+        if size:
+            entry['size'] = list(size)
+        entries.append((key, entry, data))
+
+    if old is not None:
+        unchanged = not rebuilt and set(old.index) == {key for key, _, _ in entries} and all(
+            old.index[key]['stamp'] == entry['stamp'] for key, entry, _ in entries)
+        old.close()
+        if unchanged:
+            return rebuilt, reused
+
+    # Offsets depend on the index length, so lay out the blobs after sizing it
+    # with placeholder offsets wide enough for any real value
+    for _, entry, data in entries:
+        entry['offset'] = 10 ** 12
+        entry['length'] = len(data)
+    index_length = len(json.dumps({key: entry for key, entry, _ in entries}).encode())
+    offset = align(BUNDLE_HEADER.size + index_length)
+    for _, entry, data in entries:
+        entry['offset'] = offset
+        offset = align(offset + len(data))
+    index = json.dumps({key: entry for key, entry, _ in entries}).encode().ljust(index_length)
+
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(BUNDLE_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, index_length))
+        f.write(index)
+        for _, entry, data in entries:
+            f.seek(entry['offset'])
+            f.write(data)
+        f.truncate(offset)
+    # Windows cannot replace a file that is still mapped
+    sprites.close_bundle()
+    os.replace(tmp, path)
+    return rebuilt, reused
+
+def align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
 if __name__ == '__main__':
-    sprites_folder = 'sprites'
-    if os.path.exists(sprites_folder) and os.path.isdir(sprites_folder):
-        process_sprites_folder(sprites_folder)
-    else:
-        print(f"Folder '{sprites_folder}' not found.")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Pre-scale the sprites and pack them with the sounds into a bundle')
+    parser.add_argument('--output', default=BUNDLE_PATH)
+    parser.add_argument('--force', action='store_true', help='rebuild every entry, even if unchanged')
+    parser.add_argument('--strip-icc', action='store_true', help='strip ICC profiles from sprites/*.png first')
+    args = parser.parse_args()
+
+    if args.strip_icc:
+        sprites_folder = 'sprites'
+        if os.path.exists(sprites_folder) and os.path.isdir(sprites_folder):
+            process_sprites_folder(sprites_folder)
+        else:
+            print(f"Folder '{sprites_folder}' not found.")
+    rebuilt, reused = build_bundle(args.output, args.force)
+    print(f'{args.output}: {rebuilt} rebuilt, {reused} unchanged, {os.path.getsize(args.output)} bytes')
@@ -0,0 +1,121 @@
+import numpy as np
+
+from spatial import SpatialGrid
+
+
+class Formation:
+    """Enemy formation stored as parallel NumPy arrays.
+
+    Enemy `i` sits at row i // cols, column i % cols. Positions and alive
+    flags live in one array each, so marching, dropping and the bounds and
+    win/lose checks are each a single vectorized operation instead of a loop
+    over Enemy objects. The whole formation shares one animation clock.
+    """
+
+    def __init__(self, rows, cols, width, height, x_offset=50, y_offset=50, padding=10,
+                 animation_interval=20):
+        self.rows = rows
+        self.cols = cols
+        self.width = width
+        self.height = height
+        self.animation_interval = animation_interval
+
+        row, col = np.divmod(np.arange(rows * cols), cols)
+        self.x = (x_offset + col * (width + padding)).astype(np.float64)
+        self.y = (y_offset + row * (height + padding)).astype(np.float64)
+        # Positions before the latest march, for interpolated rendering
+        self.prev_x = self.x.copy()
+        self.prev_y = self.y.copy()
+        self.alive = np.ones(rows * cols, dtype=bool)
+        self.alive_count = rows * cols
+        self.animation_timer = 0
+        self.use_up_image = True
+
+        # Broad phase: one grid cell per formation slot. The grid moves with
+        # the formation, so only deaths ever change its buckets.
+        self.grid = SpatialGrid(width + padding, height + padding, x_offset, y_offset)
+        for i in range(rows * cols):
+            self.grid.insert(i, self.x[i], self.y[i], width, height)
+
+    def __len__(self):
+        return len(self.alive)
+
+    def position(self, index):
+        return float(self.x[index]), float(self.y[index])
+
+    def will_cross(self, dx, screen_width):
+        """Return True if any alive enemy would leave the screen moving by dx."""
+        if not self.alive_count:
+            return False
+        x = self.x[self.alive]
+        return bool(x.min() + dx < 0 or x.max() + self.width + dx > screen_width)
+
+    def march(self, dx, dy):
+        """Move every alive enemy by (dx, dy) and advance its animation."""
+        alive = self.alive
+        np.copyto(self.prev_x, self.x)
+        np.copyto(self.prev_y, self.y)
+        np.add(self.x, dx, out=self.x, where=alive)
+        np.add(self.y, dy, out=self.y, where=alive)
+        self.grid.translate(dx, dy)
+        self.animation_timer += 1
+        if self.animation_timer >= self.animation_interval:
+            self.animation_timer = 0
+            self.use_up_image = not self.use_up_image
+
+    def kill(self, index):
+        if self.alive[index]:
+            self.alive[index] = False
+            self.alive_count -= 1
+            self.grid.remove(index)
+
+    def all_dead(self):
+        return self.alive_count == 0
+
+    def alive_indices(self):
+        return np.flatnonzero(self.alive)
+
+    def reached(self, line_y):
+        """Return True if any alive enemy's bottom edge is at or below line_y."""
+        if not self.alive_count:
+            return False
+        return bool(self.y[self.alive].max() + self.height >= line_y)
+
+    def hit_test(self, rect, narrow=None):
+        """Return the index of the first alive enemy overlapping rect, or None.
+
+        Only enemies bucketed near rect are tested, using the same strict
+        overlap rule as pygame.Rect.colliderect. With `narrow`, a
+        NarrowPhase, enemies that pass the rect test must also overlap an
+        opaque pixel of the current animation frame.
+        """
+        candidates = []
+        for i in self.grid.query(rect):
+            x = self.x[i]
+            y = self.y[i]
+            if x < rect.right and x + self.width > rect.left and y < rect.bottom and y + self.height > rect.top:
+                candidates.append(i)
+        if not candidates:
+            return None
+        if narrow is None:
+            return min(candidates)
+        frame = 'enemy_up' if self.use_up_image else 'enemy_down'
+        for i in sorted(candidates):
+            if narrow.rect_overlaps(rect, frame, self.x[i], self.y[i]):
+                return i
+        return None
+
+    def draw(self, surface, atlas, alpha=1.0):
+        """Blit every alive enemy in one batched call and return the rects.
+
+        With alpha < 1 enemies are drawn that far from their previous
+        position towards the current one.
+        """
+        alive = self.alive
+        frame = 'enemy_up' if self.use_up_image else 'enemy_down'
+        x = self.x[alive]
+        y = self.y[alive]
+        if alpha < 1.0:
+            x = self.prev_x[alive] + (x - self.prev_x[alive]) * alpha
+            y = self.prev_y[alive] + (y - self.prev_y[alive]) * alpha
+        return atlas.blits(surface, frame, zip(x.tolist(), y.tolist()))
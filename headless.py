@@ -0,0 +1,102 @@
+"""Run the game simulation without a window or audio device.
+
+Importing this module selects the SDL dummy video and audio drivers before
+pygame is initialised, so GameState can be stepped as fast as the CPU allows.
+"""
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import space_invaders  # noqa: E402
+
+
+def idle_policy(state):
+    return 0
+
+
+def sweeping_policy(state):
+    """Sweep the ship across the screen, firing every other frame."""
+    inputs = space_invaders.INPUT_LEFT if (state.frame // 120) % 2 else space_invaders.INPUT_RIGHT
+    if state.frame % 2 == 0:
+        inputs |= space_invaders.INPUT_FIRE
+    return inputs
+
+
+def run(frames, policy=idle_policy, rows=5, cols=10, observer=None, seed=None, config=None):
+    """Step a fresh game for up to `frames` frames and return its state.
+
+    `policy(state)` returns the input bitmask for the next step. `observer`,
+    when given, is called as observer(state) after every step, e.g. to render.
+    """
+    state = space_invaders.GameState(rows, cols, seed=seed, config=config)
+    for _ in range(frames):
+        state.step(policy(state))
+        if observer is not None:
+            observer(state)
+        if state.game_over:
+            break
+    return state
+
+
+def measure_allocations(frames, policy=idle_policy, rows=5, cols=10, warmup=120):
+    """Step a game and return an AllocationMeter covering each frame after warmup."""
+    from pools import AllocationMeter
+
+    meter = AllocationMeter(history=frames)
+    state = space_invaders.GameState(rows, cols)
+    for frame in range(warmup + frames):
+        if frame >= warmup:
+            meter.begin()
+        state.step(policy(state))
+        if frame >= warmup:
+            meter.end()
+        if state.game_over:
+            break
+    return meter
+
+
+def check_dirty_rects(frames, seeds=(1, 2, 3, 4), policy=sweeping_policy, alpha=0.5, config=None):
+    """Render games both through DirtyRenderer and as full redraws, comparing every frame.
+
+    Anything drawn outside the rects draw_scene() reports is never erased by
+    the dirty-rect renderer and shows up as a difference. Returns a list of
+    (seed, frame, differing pixels) for each frame whose output differs.
+    """
+    import numpy as np
+    import pygame
+    from renderer import DirtyRenderer
+
+    screen = space_invaders.init_display()
+    font = pygame.font.SysFont(None, 36)
+    canvas = pygame.Surface(screen.get_size()).convert(screen)
+    mismatches = []
+    for seed in seeds:
+        state = space_invaders.GameState(seed=seed, config=config)
+        renderer = DirtyRenderer(screen)
+        for _ in range(frames):
+            state.step(policy(state))
+            if state.game_over:
+                break
+            renderer.begin()
+            renderer.extend(space_invaders.draw_scene(screen, state, font, clear=False, alpha=alpha))
+            renderer.present()
+            space_invaders.draw_scene(canvas, state, font, alpha=alpha)
+            # Both surfaces share one pixel format, so their raw bytes compare directly
+            if screen.get_buffer().raw != canvas.get_buffer().raw:
+                differing = np.count_nonzero(pygame.surfarray.array2d(screen) != pygame.surfarray.array2d(canvas))
+                mismatches.append((seed, state.frame, int(differing)))
+    return mismatches
+
+
+if __name__ == '__main__':
+    import time
+
+    start = time.perf_counter()
+    state = run(3600)
+    elapsed = time.perf_counter() - start
+    print(f'{state.frame} frames in {elapsed:.3f}s ({state.frame / elapsed:.0f} steps/sec), score {state.score}')
+    print(f'narrow-phase mask tests: {state.narrow.mean_tests():.3f} per frame, {state.narrow.total + state.narrow.tests} total')
+    print('allocations per frame:', measure_allocations(3600).summary())
+    mismatches = check_dirty_rects(1200)
+    print(f'dirty-rect frames differing from a full redraw: {len(mismatches)}', mismatches[:3])
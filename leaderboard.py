@@ -0,0 +1,215 @@
+import json
+import sqlite3
+import threading
+import time
+
+DEFAULT_SCORES = [
+    {'name': 'CPU', 'score': 2000},
+    {'name': 'CPU', 'score': 1500},
+    {'name': 'CPU', 'score': 1000},
+    {'name': 'CPU', 'score': 500},
+    {'name': 'CPU', 'score': 250}
+]
+
+
+# Scores are counted in a Fenwick tree over [0, 2 ** SCORE_BITS), stored as
+# one row per tree node, so ranking a score reads at most SCORE_BITS rows.
+# Runs are stored with their real score; scores above MAX_SCORE share the
+# tree's top slot, so rank() does not order them among themselves.
+SCORE_BITS = 24
+MAX_SCORE = (1 << SCORE_BITS) - 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC, name);
+CREATE TABLE IF NOT EXISTS player_best (
+    name TEXT PRIMARY KEY,
+    score INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS score_tree (
+    node INTEGER PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+"""
+
+
+class SQLiteLeaderboard:
+    """Leaderboard for any number of runs in a local SQLite database.
+
+    - top(k) walks the runs_by_score index: O(log n + k)
+    - rank(score) sums at most SCORE_BITS Fenwick tree rows: O(log MAX_SCORE)
+    - best(name) is a primary key lookup on player_best: O(log players)
+    - add_many() inserts a batch of runs in a single transaction
+
+    It also provides the small scores()/is_high_score()/add() interface the
+    game uses, serving the top `max_entries` runs from memory. add() only
+    updates that table and queues the run; a background thread commits it,
+    so the render loop never waits on disk I/O, and flush() waits for it.
+    The cached table is refreshed when another connection commits a change,
+    which SQLite reports through PRAGMA data_version, or once this one's
+    queued runs are committed.
+    """
+
+    def __init__(self, path='high_scores.db', max_entries=5, check_interval=1.0, import_json=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.check_interval = check_interval
+        # Shared with the writer thread; every use holds self._lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.executescript(SCHEMA)
+        self._top = None
+        self._data_version = None
+        self._next_check = 0.0
+        self._pending = []
+        self._writer = None
+        self._writing = False
+        self._committed = False
+        if import_json and self.count() == 0:
+            self._import_json(import_json)
+
+    def _import_json(self, json_path):
+        try:
+            with open(json_path, 'r') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = DEFAULT_SCORES
+        self.add_many((entry['name'], entry['score']) for entry in entries)
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+    # Queries
+
+    def _prefix_count(self, score):
+        """Number of runs scoring at most `score`."""
+        if score < 0:
+            return 0
+        nodes = []
+        i = min(score, MAX_SCORE) + 1
+        while i > 0:
+            nodes.append(i)
+            i -= i & -i
+        placeholders = ','.join('?' * len(nodes))
+        with self._lock:
+            row = self._conn.execute(
+                f'SELECT COALESCE(SUM(count), 0) FROM score_tree WHERE node IN ({placeholders})', nodes).fetchone()
+        return row[0]
+
+    def count(self):
+        return self._prefix_count(MAX_SCORE)
+
+    def rank(self, score):
+        """1-based position `score` would take: one more than the runs beating it."""
+        return self.count() - self._prefix_count(score) + 1
+
+    def top(self, k):
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT name, score FROM runs ORDER BY score DESC, name LIMIT ?', (k,)).fetchall()
+        return [{'name': name, 'score': score} for name, score in rows]
+
+    def best(self, name):
+        with self._lock:
+            row = self._conn.execute('SELECT score FROM player_best WHERE name = ?', (name,)).fetchone()
+        return row[0] if row else None
+
+    # Inserts
+
+    def add_many(self, runs):
+        """Insert (name, score) pairs in one transaction."""
+        runs = [(name, int(score)) for name, score in runs]
+        if not runs:
+            return
+        with self._lock:
+            self._insert(runs)
+        self._top = None
+
+    def _insert(self, runs):
+        # Called with the lock held
+        now = time.time()
+        deltas = {}
+        for _, score in runs:
+            i = max(0, min(score, MAX_SCORE)) + 1
+            while i <= MAX_SCORE + 1:
+                deltas[i] = deltas.get(i, 0) + 1
+                i += i & -i
+        with self._conn:
+            self._conn.executemany(
+                'INSERT INTO runs (name, score, created) VALUES (?, ?, ?)',
+                [(name, score, now) for name, score in runs])
+            self._conn.executemany(
+                'INSERT INTO player_best (name, score) VALUES (?, ?) '
+                'ON CONFLICT(name) DO UPDATE SET score = MAX(score, excluded.score)', runs)
+            self._conn.executemany(
+                'INSERT INTO score_tree (node, count) VALUES (?, ?) '
+                'ON CONFLICT(node) DO UPDATE SET count = count + excluded.count', deltas.items())
+
+    # Game interface
+
+    def scores(self):
+        """Return the top `max_entries` runs, best first."""
+        if self._top is not None and self._writing:
+            # The table already includes the runs being written
+            return list(self._top)
+        if self._committed:
+            self._committed = False
+            self._top = None
+        now = time.monotonic()
+        if self._top is not None and now >= self._next_check:
+            self._next_check = now + self.check_interval
+            with self._lock:
+                version = self._conn.execute('PRAGMA data_version').fetchone()[0]
+            if version != self._data_version:
+                self._top = None
+        if self._top is None:
+            with self._lock:
+                self._data_version = self._conn.execute('PRAGMA data_version').fetchone()[0]
+            self._top = self.top(self.max_entries)
+        return list(self._top)
+
+    def is_high_score(self, score):
+        scores = self.scores()
+        if len(scores) < self.max_entries:
+            return True
+        return score > scores[-1]['score']
+
+    def add(self, score, name):
+        """Record a run without waiting for it to be written."""
+        score = int(score)
+        top = self.scores()
+        top.append({'name': name, 'score': score})
+        top.sort(key=lambda entry: (-entry['score'], entry['name']))
+        self._top = top[:self.max_entries]
+        with self._lock:
+            self._pending.append((name, score))
+            if not self._writing:
+                self._writing = True
+                self._writer = threading.Thread(target=self._write_pending, name='leaderboard-writer')
+                self._writer.start()
+
+    def _write_pending(self):
+        while True:
+            with self._lock:
+                runs = self._pending
+                self._pending = []
+                if not runs:
+                    self._writing = False
+                    return
+                try:
+                    self._insert(runs)
+                except sqlite3.Error as e:
+                    print(f'Error saving high score: {e}')
+                self._committed = True
+
+    def flush(self):
+        """Block until every queued run has been committed."""
+        writer = self._writer
+        if writer is not None:
+            writer.join()
@@ -0,0 +1,132 @@
+import numpy as np
+import pygame
+
+# Global particle budget; new bursts overwrite the oldest particles beyond it
+MAX_PARTICLES = 1024
+PARTICLE_SIZE = 2  # px square
+GRAVITY = 0.04  # px per step, per step
+DRAG = 0.96  # velocity kept per step
+TILE = 32  # px; dirty rects are reported per touched tile
+
+# Burst styles: kind -> (particles, max speed in px per step, max lifetime in steps, palette)
+BURSTS = {
+    'enemy': (24, 3.0, 30, ((255, 255, 255), (120, 200, 255), (80, 120, 255))),
+    'ufo': (40, 4.0, 40, ((255, 60, 60), (255, 160, 60), (255, 255, 160))),
+    'ship': (64, 4.5, 50, ((0, 255, 0), (180, 255, 120), (255, 200, 60), (255, 255, 255))),
+}
+
+
+class ParticleSystem:
+    """Debris and sparks for every live particle, held in preallocated arrays.
+
+    Particles live in a ring of `capacity` slots. A burst writes the slots
+    after the last one written, so once the budget is used up the oldest
+    particles are overwritten first. `update()` integrates the whole ring
+    in a few NumPy operations and `draw()` writes every particle straight
+    into the surface's pixels, so no per-particle Python objects exist.
+
+    Particles are cosmetic: they use their own generator, never the game's,
+    so they do not change how a seed and inputs replay.
+    """
+
+    def __init__(self, capacity=MAX_PARTICLES, bounds=(800, 600), seed=None):
+        self.capacity = capacity
+        self.bounds = bounds
+        self._limits = np.subtract(bounds, PARTICLE_SIZE)  # exclusive top-left limits on screen
+        self.rng = np.random.default_rng(seed)
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.life = np.zeros(capacity, dtype=np.int32)  # steps left; 0 is a free slot
+        self.ttl = np.ones(capacity, dtype=np.int32)  # lifetime at spawn, for fading
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.head = 0  # next slot to write
+        self.count = 0  # live particles
+        self.evicted = 0  # live particles overwritten to stay within budget
+
+    def __len__(self):
+        return self.count
+
+    def burst(self, kind, x, y):
+        """Spawn a burst of style `kind` centred on (x, y)."""
+        n, speed, life, palette = BURSTS[kind]
+        n = min(n, self.capacity)
+        slots = (self.head + np.arange(n)) % self.capacity
+        self.head = (self.head + n) % self.capacity
+        evicted = np.count_nonzero(self.life[slots])
+        self.evicted += evicted
+        rng = self.rng
+        angle = rng.uniform(0.0, 2.0 * np.pi, n)
+        magnitude = speed * np.sqrt(rng.uniform(0.05, 1.0, n))
+        self.pos[slots] = (x, y)
+        self.vel[slots, 0] = np.cos(angle) * magnitude
+        self.vel[slots, 1] = np.sin(angle) * magnitude
+        lifetimes = rng.integers(life // 2, life + 1, n)
+        self.life[slots] = lifetimes
+        self.ttl[slots] = lifetimes
+        self.color[slots] = np.asarray(palette, dtype=np.uint8)[rng.integers(0, len(palette), n)]
+        self.count += n - evicted
+
+    def update(self):
+        """Advance every particle by one simulation step."""
+        if not self.count:
+            return
+        life = self.life
+        vel = self.vel
+        vel *= DRAG
+        vel[:, 1] += GRAVITY
+        self.pos += vel
+        np.subtract(life, 1, out=life, where=life > 0)
+        # Particles leaving the screen die early
+        outside = (self.pos < 0.0) | (self.pos >= self._limits)
+        life[outside[:, 0] | outside[:, 1]] = 0
+        self.count = np.count_nonzero(life)
+
+    def clear(self):
+        self.life[:] = 0
+        self.count = 0
+
+    def draw(self, surface, alpha=1.0):
+        """Draw every live particle, faded by age; returns the dirty rects.
+
+        `alpha` places particles between the previous and the latest step.
+        One rect is returned per TILE x TILE screen tile that holds a
+        particle, which keeps the list short for the dirty-rect renderer.
+        """
+        if not self.count:
+            return []
+        live = np.flatnonzero(self.life)
+        pos = self.pos.take(live, axis=0)
+        if alpha < 1.0:
+            # pos - vel undoes the last step's move, ignoring drag and gravity
+            pos -= self.vel.take(live, axis=0) * (1.0 - alpha)
+        width, height = surface.get_size()
+        xy = np.clip(pos.astype(np.intp), 0, (width - PARTICLE_SIZE, height - PARTICLE_SIZE))
+        x, y = xy.T
+        # Fade with age in 1/256 steps, in integer arithmetic
+        level = (self.life.take(live) << 8) // self.ttl.take(live)
+        colors = ((self.color.take(live, axis=0) * level[:, None]) >> 8).astype(np.uint8)
+        if surface.get_bytesize() != 3:
+            # Write mapped pixel values; one indexed store per pixel of the square
+            mapped = pygame.surfarray.map_array(surface, colors[None])[0]
+            pixels = pygame.surfarray.pixels2d(surface)
+            for dx in range(PARTICLE_SIZE):
+                column = x + dx if dx else x
+                for dy in range(PARTICLE_SIZE):
+                    pixels[column, y + dy if dy else y] = mapped
+            del pixels  # release the surface lock
+        else:
+            # surfarray.pixels2d cannot address 24 bit surfaces
+            for px, py, color in zip(x.tolist(), y.tolist(), colors.tolist()):
+                surface.fill(color, (px, py, PARTICLE_SIZE, PARTICLE_SIZE))
+        # Mark the tiles under all four corners of each particle's square, as
+        # one that straddles a tile corner touches four tiles
+        columns = (width + TILE - 1) // TILE
+        touched = np.zeros(columns * ((height + TILE - 1) // TILE), dtype=bool)
+        far = PARTICLE_SIZE - 1
+        tile_x = (x // TILE, (x + far) // TILE)
+        tile_y = (y // TILE * columns, (y + far) // TILE * columns)
+        for tx in tile_x:
+            for ty in tile_y:
+                touched[ty + tx] = True
+        return [pygame.Rect((t % columns) * TILE, (t // columns) * TILE, TILE, TILE)
+                for t in np.flatnonzero(touched).tolist()]
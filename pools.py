@@ -0,0 +1,95 @@
+import sys
+import tracemalloc
+from collections import deque
+from itertools import islice
+
+
+class Pool:
+    """Fixed-capacity pool of reusable entities.
+
+    All instances are created up front by `factory`. Live entities occupy
+    items[:count]; spawning hands out the next free slot and `compact()`
+    drops inactive entities with in-place swap-remove, so steady-state
+    gameplay never creates or frees entity objects. Pooled classes must
+    provide `reset(*args)` and an `active` flag.
+    """
+
+    def __init__(self, factory, capacity):
+        self.capacity = capacity
+        self.items = [factory() for _ in range(capacity)]
+        self.count = 0
+        self.dropped = 0  # spawns refused because the pool was full
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def __iter__(self):
+        return islice(self.items, self.count)
+
+    def spawn(self, *args):
+        """Reset the next free entity with args and return it, or None if full."""
+        if self.count == self.capacity:
+            self.dropped += 1
+            return None
+        item = self.items[self.count]
+        item.reset(*args)
+        self.count += 1
+        return item
+
+    def compact(self):
+        """Release inactive entities by swapping them past the live range."""
+        items = self.items
+        i = 0
+        while i < self.count:
+            if items[i].active:
+                i += 1
+            else:
+                last = self.count - 1
+                items[i], items[last] = items[last], items[i]
+                self.count = last
+
+    def clear(self):
+        for item in islice(self.items, self.count):
+            item.active = False
+        self.count = 0
+
+
+class AllocationMeter:
+    """Measure memory allocated across each frame.
+
+    `blocks` records the net change in live interpreter memory blocks per
+    frame. Once gameplay reaches a steady state it only jitters by a block
+    or so as numeric objects are recycled, and sums to zero over time. If
+    tracemalloc is tracing, `peak_bytes` also records the transient peak
+    allocated during each frame.
+    """
+
+    def __init__(self, history=600):
+        self.blocks = deque(maxlen=history)
+        self.peak_bytes = deque(maxlen=history)
+        self._start_blocks = 0
+        self._start_bytes = 0
+
+    def begin(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self._start_bytes = tracemalloc.get_traced_memory()[0]
+        self._start_blocks = sys.getallocatedblocks()
+
+    def end(self):
+        self.blocks.append(sys.getallocatedblocks() - self._start_blocks)
+        if tracemalloc.is_tracing():
+            self.peak_bytes.append(tracemalloc.get_traced_memory()[1] - self._start_bytes)
+
+    def summary(self):
+        frames = len(self.blocks)
+        return {
+            'frames': frames,
+            'allocating_frames': sum(1 for b in self.blocks if b > 0),
+            'net_blocks': sum(self.blocks),
+            'max_blocks': max(self.blocks) if self.blocks else 0,
+            'max_peak_bytes': max(self.peak_bytes) if self.peak_bytes else None,
+        }
@@ -0,0 +1,58 @@
+import pygame
+from colors import Colors
+
+
+class DirtyRenderer:
+    """Present only the parts of the screen that changed.
+
+    Each frame the caller erases last frame's sprites with `begin()`, draws
+    and records the rect of everything drawn with `add()`, then calls
+    `present()`. Only the union of last frame's and this frame's rects is
+    pushed with pygame.display.update(). When those rects cover more than
+    `full_flip_ratio` of the screen, or after `invalidate()`, the whole
+    surface is cleared and flipped instead.
+    """
+
+    def __init__(self, surface, background=Colors.BLACK, full_flip_ratio=0.5):
+        self.surface = surface
+        self.background = background
+        self.full_flip_area = surface.get_width() * surface.get_height() * full_flip_ratio
+        self._previous = []
+        self._current = []
+        self._full = True
+        self.full_flips = 0
+        self.partial_updates = 0
+
+    def invalidate(self):
+        """Force a full clear and flip on the next frame, e.g. after a menu."""
+        self._full = True
+
+    def begin(self):
+        if self._full:
+            self.surface.fill(self.background)
+        else:
+            fill = self.surface.fill
+            for rect in self._previous:
+                fill(self.background, rect)
+        self._current = []
+
+    def add(self, rect):
+        if rect:
+            self._current.append(rect)
+
+    def extend(self, rects):
+        for rect in rects:
+            self.add(rect)
+
+    def present(self):
+        rects = self._previous + self._current
+        if not self._full and sum(r.width * r.height for r in rects) > self.full_flip_area:
+            self._full = True
+        if self._full:
+            pygame.display.flip()
+            self.full_flips += 1
+            self._full = False
+        else:
+            pygame.display.update(rects)
+            self.partial_updates += 1
+        self._previous = self._current
@@ -0,0 +1,140 @@
+"""Record games as a seed plus one input byte per frame, and replay them.
+
+A replay file is a fixed header followed by the zlib-compressed input log:
+
+    magic b'SIRP', version, rows, cols, seed, frames, final score
+
+Replays run headless at full speed. Snapshots of the game state are taken
+every `snapshot_interval` frames while replaying, so seeking back to any
+frame only re-simulates from the nearest earlier snapshot.
+"""
+import bisect
+import struct
+import zlib
+
+MAGIC = b'SIRP'
+VERSION = 4  # bumped whenever the simulation changes, as old replays no longer reproduce
+HEADER = struct.Struct('<4sHHHqII')
+
+
+class Replay:
+    def __init__(self, seed, rows=5, cols=10, inputs=b'', final_score=None):
+        self.seed = seed
+        self.rows = rows
+        self.cols = cols
+        self.inputs = bytearray(inputs)
+        self.final_score = final_score
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def to_bytes(self):
+        header = HEADER.pack(MAGIC, VERSION, self.rows, self.cols, self.seed,
+                             len(self.inputs), self.final_score or 0)
+        return header + zlib.compress(bytes(self.inputs), 9)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, rows, cols, seed, frames, final_score = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('not a Space Invaders replay (or an unsupported version)')
+        inputs = zlib.decompress(data[HEADER.size:])
+        if len(inputs) != frames:
+            raise ValueError(f'replay is truncated: {len(inputs)} of {frames} frames')
+        return cls(seed, rows, cols, inputs, final_score)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayRecorder:
+    """Log the inputs fed to a GameState so the game can be replayed."""
+
+    def __init__(self, state):
+        self.state = state
+        self.replay = Replay(state.seed, state.rows, state.cols)
+
+    def step(self, inputs):
+        """Record `inputs` and step the game with them."""
+        if not self.state.game_over:
+            self.replay.inputs.append(inputs)
+        events = self.state.step(inputs)
+        self.replay.final_score = self.state.score
+        return events
+
+    def save(self, path):
+        self.replay.save(path)
+
+
+class Replayer:
+    """Re-simulate a Replay headless, with snapshot-based seeking."""
+
+    def __init__(self, replay, snapshot_interval=600):
+        self.replay = replay
+        self.snapshot_interval = snapshot_interval
+        from space_invaders import GameState
+        self.state = GameState(replay.rows, replay.cols, seed=replay.seed)
+        self._snapshot_frames = [0]
+        self._snapshots = [self.state.snapshot()]
+
+    @property
+    def frame(self):
+        return self.state.frame
+
+    def _step(self):
+        state = self.state
+        state.step(self.replay.inputs[state.frame])
+        if state.frame % self.snapshot_interval == 0 and state.frame > self._snapshot_frames[-1]:
+            self._snapshot_frames.append(state.frame)
+            self._snapshots.append(state.snapshot())
+
+    def run_to(self, frame):
+        """Step forward until `frame` (or the end of the replay) is reached."""
+        frame = min(frame, len(self.replay))
+        while self.state.frame < frame and not self.state.game_over:
+            self._step()
+        return self.state
+
+    def seek(self, frame):
+        """Jump to `frame`, restoring the nearest snapshot at or before it."""
+        frame = max(0, min(frame, len(self.replay)))
+        i = bisect.bisect_right(self._snapshot_frames, frame) - 1
+        if frame < self.state.frame or self._snapshot_frames[i] > self.state.frame:
+            self.state = self._snapshots[i].snapshot()
+        return self.run_to(frame)
+
+    def verify(self):
+        """Replay to the end and check it reproduces the recorded score."""
+        state = self.run_to(len(self.replay))
+        return state.frame == len(self.replay) and state.score == self.replay.final_score
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    import headless  # noqa: F401 (selects the SDL dummy drivers before pygame starts)
+
+    parser = argparse.ArgumentParser(description='Replay a recorded Space Invaders game headless')
+    parser.add_argument('path')
+    parser.add_argument('--seek', type=int, help='stop at this frame and print the state')
+    args = parser.parse_args()
+
+    replay = Replay.load(args.path)
+    replayer = Replayer(replay)
+    start = time.perf_counter()
+    if args.seek is not None:
+        state = replayer.seek(args.seek)
+        print(f'frame {state.frame}: score {state.score}, ship x {state.spaceship.x}, '
+              f'{state.formation.alive_count} enemies left')
+    else:
+        ok = replayer.verify()
+        elapsed = time.perf_counter() - start
+        print(f'{replayer.frame} frames in {elapsed:.3f}s ({replayer.frame / max(elapsed, 1e-9):.0f} frames/sec): '
+              f'score {replayer.state.score}, recorded {replay.final_score} -> {"OK" if ok else "MISMATCH"}')
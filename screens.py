@@ -1,46 +1,113 @@
 import pygame
 from colors import Colors
+from assets import load_sprite
+from text_cache import render_text
+from compositor import Compositor
 
+# Created on the first visit and reused on every restart
+_prompt_font = None
+_intro_layers = None
 
-def show_start_screen(screen):
-    """Display the intro screen with an image and prompt to start the game."""
+# Returned by an IdleScreen handler to ask for the frame to be redrawn
+REDRAW = object()
+
+# Blink period of prompts and cursors on waiting screens
+ATTRACT_INTERVAL = 500  # ms
+
+
+class IdleScreen:
+    """A waiting screen that only draws when something changes.
+
+    `draw(surface, tick)` composes the whole frame for attract-animation step
+    `tick`. `handle(event)` returns None to keep waiting, REDRAW after
+    changing what draw() shows, or any other value to leave the screen with
+    it. Between frames the loop blocks in pygame.event.wait(), so a waiting
+    screen uses no CPU until there is input or the next attract step is due.
+    """
+
+    def __init__(self, surface, draw, handle, attract_interval=ATTRACT_INTERVAL):
+        self.surface = surface
+        self.draw = draw
+        self.handle = handle
+        self.attract_interval = attract_interval
+        self.tick = 0
+        self.frames = 0
+        self.dirty = True
+
+    def redraw(self):
+        self.draw(self.surface, self.tick)
+        pygame.display.flip()
+        self.frames += 1
+        self.dirty = False
+
+    def run(self):
+        interval = self.attract_interval
+        next_attract = pygame.time.get_ticks() + interval if interval else None
+        while True:
+            if self.dirty:
+                self.redraw()
+            if next_attract is None:
+                event = pygame.event.wait()
+            else:
+                event = pygame.event.wait(max(1, next_attract - pygame.time.get_ticks()))
+            if next_attract is not None and pygame.time.get_ticks() >= next_attract:
+                self.tick += 1
+                next_attract = pygame.time.get_ticks() + interval
+                self.dirty = True
+            if event.type != pygame.NOEVENT:
+                result = self.handle(event)
+                if result is REDRAW:
+                    self.dirty = True
+                elif result is not None:
+                    return result
+
+
+def show_start_screen(screen, report=None):
+    """Display the intro screen with an image and prompt to start the game.
+
+    `report`, if given, is a StartupReport to mark when the first frame is shown.
+    """
+    global _prompt_font, _intro_layers
     # Initialize font module
     pygame.font.init()
-    
-    # Load the intro screen image from the sprites folder
-    start_image = pygame.image.load('sprites/IntroScreen.png').convert()
-    
-    # Scale the image to 90% of the screen height
-    scaled_height = int(screen.get_height() * 0.9)
-    start_image = pygame.transform.scale(start_image, (screen.get_width(), scaled_height))
-    
-    # Setup font and render the prompt text
-    font = pygame.font.SysFont(None, 48)
-    text = font.render("Press any key to start", True, Colors.WHITE)
-    
-    # Create a rectangle for the text background covering the bottom 10% of the screen
-    text_bg_rect = pygame.Rect(0, scaled_height, screen.get_width(), screen.get_height() - scaled_height)
-    
-    # Calculate text position centered in the bottom area
-    text_rect = text.get_rect(center=(screen.get_width() // 2, scaled_height + (screen.get_height() - scaled_height) // 2))
-    
-    # Loop until user presses any key
-    waiting = True
-    while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.KEYDOWN:
-                waiting = False
-            elif event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-        
-        # Blit the intro image in the top 90% of the screen
-        screen.blit(start_image, (0, 0))
-        
-        # Fill the bottom area with a black rectangle for better text visibility
-        pygame.draw.rect(screen, Colors.BLACK, text_bg_rect)
-        
-        # Blit the prompt text on top of the black rectangle
-        screen.blit(text, text_rect)
-        
-        pygame.display.flip()
+    width, height = screen.get_size()
+    if _intro_layers is None:
+        _intro_layers = Compositor((width, height), ('background', 'hud'))
+    layers = _intro_layers
+
+    # Intro image in the top 90% of the screen, over a black bottom bar for
+    # better text visibility; the layer is composed once and kept across restarts
+    scaled_height = int(height * 0.9)
+
+    def render_background(layer):
+        layer.blit(load_sprite('sprites/IntroScreen.png', (width, scaled_height)), (0, 0))
+        pygame.draw.rect(layer, Colors.BLACK, (0, scaled_height, width, height - scaled_height))
+
+    layers.update('background', ('intro', width, height), render_background)
+
+    # Setup font and render the prompt text, centered in the bottom area
+    if _prompt_font is None:
+        _prompt_font = pygame.font.SysFont(None, 48)
+    text = render_text(_prompt_font, "Press any key to start", Colors.WHITE)
+    text_rect = text.get_rect(center=(width // 2, scaled_height + (height - scaled_height) // 2))
+    layers.update('hud', ('prompt', width, height), lambda layer: layer.blit(text, (0, 0)), rect=text_rect)
+
+    def draw(surface, tick):
+        # Blink the prompt
+        layers.set_visible('hud', tick % 2 == 0)
+        layers.compose(surface)
+
+    def handle(event):
+        if event.type == pygame.KEYDOWN:
+            return True
+        elif event.type == pygame.QUIT:
+            pygame.quit()
+            exit()
+        return None
+
+    # Wait until the user presses any key
+    idle = IdleScreen(screen, draw, handle)
+    idle.redraw()
+    if report:
+        report.mark('first frame')
+    return idle.run()
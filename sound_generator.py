@@ -1,8 +1,10 @@
 import pygame
 import numpy as np
 import wave
-import struct
 import os
+import json
+import hashlib
+import inspect
 
 # Sample rate explanation:
 # 44100 Hz (samples per second) is the CD-quality audio standard
@@ -12,17 +14,35 @@ import os
 # 3. 44.1 kHz gives a small buffer above the minimum required rate
 SAMPLE_RATE = 44100
 
-# Initialize pygame mixer with our sample rate
-# -16 means 16-bit signed audio
-# 1 means mono audio
-# 512 is the buffer size
-pygame.mixer.init(SAMPLE_RATE, -16, 1, 512)
+# Manifest of content hashes for the WAV files in sounds/
+CACHE_MANIFEST = 'sounds/.cache.json'
+
+# Bump to invalidate every cached sound when the output format changes
+CACHE_VERSION = 2
+
+def init_mixer():
+    """Initialize pygame mixer with our sample rate, unless already running.
+
+    -16 means 16-bit signed audio
+    1 means mono audio
+    512 is the buffer size
+    """
+    if not pygame.mixer.get_init():
+        pygame.mixer.init(SAMPLE_RATE, -16, 1, 512)
 
 def create_sound_directory():
     """Create directory for storing generated sound files."""
     if not os.path.exists('sounds'):
         os.makedirs('sounds')
 
+def to_int16(samples):
+    """Convert float samples (-1.0 to +1.0) to 16-bit PCM in one NumPy operation.
+
+    Values are clipped, scaled to the full 16-bit range (-32767 to +32767)
+    and stored little-endian ('<i2'), the byte order WAV files require.
+    """
+    return (np.clip(samples, -1.0, 1.0) * 32767.0).astype('<i2')
+
 def save_sound(name, samples):
     """Save generated sound samples as a WAV file.
     
@@ -31,9 +51,9 @@ def save_sound(name, samples):
         samples: Array of float values between -1.0 and 1.0
     
     Technical details:
-    - Uses 16-bit signed integers (struct format 'h')
-    - Scales float samples to full 16-bit range (-32767 to +32767)
-    - Uses system's native byte order (little-endian on most systems)
+    - Converts the whole clip to 16-bit signed integers at once (see to_int16)
+    - Writes all frames as a single buffer instead of one sample at a time
+    - Always little-endian, as the WAV format specifies
     
     Note on endianness:
     - Terms come from Gulliver's Travels (1726), where two groups fought over which end to break eggs:
@@ -43,22 +63,72 @@ def save_sound(name, samples):
     - Big-endian stores most significant byte first (like reading numbers left-to-right)
     - Most modern CPUs (including Intel/AMD) use little-endian for efficient arithmetic
     """
+    pcm = to_int16(samples)
     with wave.open(f'sounds/{name}.wav', 'w') as wav_file:
         # WAV file parameters
         nchannels = 1  # Mono audio
         sampwidth = 2  # 2 bytes per sample (16-bit)
         framerate = SAMPLE_RATE
-        nframes = len(samples)
+        nframes = len(pcm)
         
         # Set wav file parameters
         wav_file.setparams((nchannels, sampwidth, framerate, nframes, 'NONE', 'not compressed'))
-        
-        # Write each sample as a 16-bit integer
-        for sample in samples:
-            # Convert float (-1.0 to +1.0) to 16-bit int (-32767 to +32767)
-            # struct.pack('h', ...) creates a 2-byte string in native byte order
-            packed_value = struct.pack('h', int(sample * 32767.0))
-            wav_file.writeframes(packed_value)
+        wav_file.writeframes(pcm.tobytes())
+
+def to_mixer_format(samples, size):
+    """Convert float samples (-1.0 to +1.0) to the sample format of the mixer.
+
+    `size` is the format reported by pygame.mixer.get_init(): the bits per
+    sample, negative for signed integers. pygame reports 32-bit float audio
+    as -32. Samples are in native byte order, as the mixer expects.
+    """
+    samples = np.clip(samples, -1.0, 1.0)
+    if abs(size) == 32:
+        return samples.astype(np.float32)
+    bits = abs(size)
+    scale = (1 << (bits - 1)) - 1
+    if size < 0:
+        return (samples * scale).astype(f'=i{bits // 8}')
+    # Unsigned formats are centred on the middle of their range
+    return (samples * scale + (scale + 1)).astype(f'=u{bits // 8}')
+
+def make_sound(samples):
+    """Create a pygame.mixer.Sound straight from float samples, without a file.
+
+    The mono clip is converted to the mixer's sample format, resampled and
+    duplicated across channels if the mixer was initialized with a
+    different rate or channel count.
+    """
+    init_mixer()
+    frequency, size, channels = pygame.mixer.get_init()
+    samples = np.asarray(samples, dtype=np.float64)
+    if frequency != SAMPLE_RATE:
+        n = int(len(samples) * frequency / SAMPLE_RATE)
+        samples = np.interp(np.linspace(0, len(samples) - 1, n), np.arange(len(samples)), samples)
+    pcm = to_mixer_format(samples, size)
+    if channels > 1:
+        pcm = np.repeat(pcm[:, None], channels, axis=1)
+    return pygame.mixer.Sound(buffer=np.ascontiguousarray(pcm).tobytes())
+
+def generator_hash(generator):
+    """Content hash of a generator's source code and the output format."""
+    digest = hashlib.sha256(inspect.getsource(generator).encode())
+    digest.update(f'{SAMPLE_RATE}:{CACHE_VERSION}'.encode())
+    return digest.hexdigest()
+
+def load_manifest():
+    try:
+        with open(CACHE_MANIFEST, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest):
+    with open(CACHE_MANIFEST, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+def is_cached(name, digest, manifest):
+    return manifest.get(name) == digest and os.path.exists(f'sounds/{name}.wav')
 
 def generate_shoot_sound():
     """Generate a shooting sound effect.
@@ -108,7 +178,33 @@ def generate_game_over_sound():
     samples = np.sin(2 * np.pi * frequency * t) * np.exp(-2 * t)
     return samples
 
-def main():
+# Sound name -> generator function
+GENERATORS = {
+    'shoot': generate_shoot_sound,
+    'explosion': generate_explosion_sound,
+    'ufo': generate_ufo_sound,
+    'game_over': generate_game_over_sound
+}
+
+def synthesize_sounds(load=None):
+    """Build every game sound in memory as pygame.mixer.Sound objects.
+
+    Sounds whose generator is unchanged since the last build are loaded from
+    their cached WAV file with `load(path)` (pygame.mixer.Sound by default);
+    the rest, including every sound when there is no manifest yet, are
+    synthesized directly into a buffer.
+    """
+    manifest = load_manifest()
+    sounds = {}
+    for name, generator in GENERATORS.items():
+        if is_cached(name, generator_hash(generator), manifest):
+            init_mixer()
+            sounds[name] = (load or pygame.mixer.Sound)(f'sounds/{name}.wav')
+        else:
+            sounds[name] = make_sound(generator())
+    return sounds
+
+def main(force=False):
     """Generate all sound effects for the Space Invaders game.
     
     Creates four distinct sound effects:
@@ -118,21 +214,23 @@ def main():
     4. Game over sound: Long descending pitch (1.0s)
     
     All sounds are generated at 44.1kHz sample rate and saved as 16-bit WAV files.
+    A sound is skipped when its generator's content hash matches the cache
+    manifest and the WAV file exists, unless `force` is set.
     """
     create_sound_directory()
+    manifest = load_manifest()
     
-    # Dictionary mapping sound names to their generated samples
-    sounds = {
-        'shoot': generate_shoot_sound(),
-        'explosion': generate_explosion_sound(),
-        'ufo': generate_ufo_sound(),
-        'game_over': generate_game_over_sound()
-    }
-    
-    # Save each sound as a WAV file
-    for name, samples in sounds.items():
-        save_sound(name, samples)
+    for name, generator in GENERATORS.items():
+        digest = generator_hash(generator)
+        if not force and is_cached(name, digest, manifest):
+            print(f"Skipped {name}.wav (unchanged)")
+            continue
+        save_sound(name, generator())
+        manifest[name] = digest
         print(f"Generated {name}.wav")
+    
+    save_manifest(manifest)
 
 if __name__ == '__main__':
-    main()
+    import sys
+    main(force='--force' in sys.argv)
@@ -1,24 +1,40 @@
 import pygame
 import sys
+import argparse
+import copy
 import random
-import json
-from screens import show_start_screen
+import time
+import numpy as np
+from screens import IdleScreen, REDRAW, show_start_screen
+from assets import load_sound, sprites
+from atlas import SpriteAtlas
+from formation import Formation
+from bunkers import Bunkers
+from particles import ParticleSystem
+from fire_control import FireControl
+from spatial import sweep
+from collision import NarrowPhase
+from pools import Pool
+from renderer import DirtyRenderer
+from compositor import Compositor
+from text_cache import render_text
+from sound_generator import synthesize_sounds
+from leaderboard import SQLiteLeaderboard
+from replay import ReplayRecorder
+from profiler import FrameProfiler
+from startup import BackgroundLoader, StartupReport
 
-# Initialize pygame and sound
-pygame.init()
-pygame.mixer.init()
+# Startup milestones, timed from import; printed once the game is ready
+STARTUP = StartupReport()
 
-# Load sound effects
-shoot_sound = pygame.mixer.Sound('sounds/shoot.wav')
-explosion_sound = pygame.mixer.Sound('sounds/explosion.wav')
-ufo_sound = pygame.mixer.Sound('sounds/ufo.wav')
-game_over_sound = pygame.mixer.Sound('sounds/game_over.wav')
-
-# Adjust sound volumes
-shoot_sound.set_volume(0.3)
-explosion_sound.set_volume(0.4)
-ufo_sound.set_volume(0.2)
-game_over_sound.set_volume(0.5)
+# Sound effects and their volumes, loaded in the background by init()
+SOUND_FILES = {
+    'shoot': ('sounds/shoot.wav', 0.3),
+    'explosion': ('sounds/explosion.wav', 0.4),
+    'ufo': ('sounds/ufo.wav', 0.2),
+    'game_over': ('sounds/game_over.wav', 0.5),
+}
+SOUNDS = {}
 
 # Screen dimensions
 SCREEN_WIDTH = 800
@@ -33,7 +49,9 @@ GREEN = Colors.GREEN
 RED = Colors.RED
 
 # Game settings
-FPS = 60
+FPS = 60  # simulation steps per second; all speeds and timers count steps
+MAX_STEPS_PER_FRAME = 5  # past this the game slows down rather than spiralling
+DIRTY_RECTS = True  # present only changed screen areas; --full-flip disables
 
 # Spaceship settings
 SHIP_WIDTH = 50
@@ -57,14 +75,18 @@ ENEMY_BULLET_SPEED = 5
 ENEMY_SHOOT_PROB = 0.005
 
 # UFO settings
+UFO_WIDTH = 60
+UFO_HEIGHT = 30
 UFO_SPEED = 3
 UFO_SPAWN_PROB = 0.004
 UFO_BONUS_POINTS = 150
 UFO_SHOOT_PROB = 0.005
 
 # Power-up settings
+POWERUP_WIDTH = 30
+POWERUP_HEIGHT = 30
 POWERUP_SPEED = 2
-POWERUP_DURATION = 300  # frames
+POWERUP_DURATION = 300  # simulation steps (1/FPS s each)
 POWERUP_DROP_CHANCE = 0.1  # 10% chance to drop from destroyed enemies
 
 # Enemy settings
@@ -74,44 +96,78 @@ ENEMY_COLOR = (0, 0, 255)
 ENEMY_SPEED = 1
 ENEMY_DROP = 20
 
-# Create the screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption('Space Invaders')
+# Ships left, drawn small under the score
+LIFE_ICON_WIDTH = 25
+LIFE_ICON_HEIGHT = 15
+
+# Every sprite frame drawn in play, at the size it is drawn: name -> (path, size)
+FRAMES = {
+    'enemy_up': ('sprites/enemyUP.png', (ENEMY_WIDTH, ENEMY_HEIGHT)),
+    'enemy_down': ('sprites/enemyDown.png', (ENEMY_WIDTH, ENEMY_HEIGHT)),
+    'ship': ('sprites/ship.png', (SHIP_WIDTH, SHIP_HEIGHT)),
+    'life': ('sprites/ship.png', (LIFE_ICON_WIDTH, LIFE_ICON_HEIGHT)),
+    'ufo': ('sprites/UFO.png', (UFO_WIDTH, UFO_HEIGHT)),
+    'power_up': ('sprites/powerUp.png', (POWERUP_WIDTH, POWERUP_HEIGHT)),
+}
+
+# Top edge of the band of destructible bunkers above the ship
+BUNKER_TOP = SCREEN_HEIGHT - 150
+
+# Pool capacities; spawns beyond these are dropped
+MAX_PLAYER_BULLETS = 4
+MAX_ENEMY_BULLETS = 128
+MAX_POWERUPS = 16
+
+# The window and clock are created by init(), so importing this module
+# (from tests and headless tools) opens no window and no audio device
+screen = None
+clock = None
+_loader = None
+_ready = False
+
+_atlas = None
+
+def get_atlas():
+    """Return the shared atlas of FRAMES, building it on first use."""
+    global _atlas
+    if _atlas is None:
+        _atlas = SpriteAtlas(FRAMES)
+    return _atlas
 
-clock = pygame.time.Clock()
+def lerp(previous, current, alpha):
+    """Render position `alpha` of the way from the previous step to the current one."""
+    if alpha >= 1.0:
+        return current
+    return previous + (current - previous) * alpha
 
 # Define the spaceship class
 class PowerUp:
-    def __init__(self, x, y, power_type):
+    __slots__ = ('x', 'y', 'prev_y', 'type', 'speed', 'active', 'width', 'height', 'rect')
+
+    def __init__(self, x=0, y=0, power_type='double_shot'):
+        self.speed = POWERUP_SPEED
+        self.width = POWERUP_WIDTH
+        self.height = POWERUP_HEIGHT
+        self.rect = pygame.Rect(x, y, self.width, self.height)
+        self.reset(x, y, power_type)
+
+    def reset(self, x, y, power_type):
         self.x = x
-        self.y = y
+        self.y = self.prev_y = y
         self.type = power_type
-        self.speed = POWERUP_SPEED
         self.active = True
-        self.width = 30
-        self.height = 30
-        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
-        
-        # Load the power-up sprite
-        try:
-            self.image = pygame.transform.scale(pygame.image.load('sprites/powerUp.png'), (self.width, self.height))
-        except:
-            # Fallback to a colored rectangle if image not found
-            self.image = None
+        self.rect.x = x
+        self.rect.y = y
             
     def update(self):
+        self.prev_y = self.y
         self.y += self.speed
         if self.y > SCREEN_HEIGHT:
             self.active = False
         self.rect.y = self.y
         
-    def draw(self, surface):
-        if self.image:
-            surface.blit(self.image, (self.x, self.y))
-        else:
-            # Use different colors for different power-up types
-            color = (255, 255, 0) if self.type == 'double_shot' else (0, 255, 255)  # Yellow for double shot, cyan for shield
-            pygame.draw.rect(surface, color, self.rect)
+    def draw(self, surface, alpha=1.0):
+        return get_atlas().blit(surface, 'power_up', (self.x, lerp(self.prev_y, self.y, alpha)))
 
 class Spaceship:
     def __init__(self):
@@ -123,10 +179,6 @@ class Spaceship:
         self.flash_interval = 10  # Flash every 10 frames
         self.invulnerable = False
         self.reset_position()
-        # Load and resize spaceship image
-        self.image = pygame.transform.scale(pygame.image.load('sprites/ship.png'), (SHIP_WIDTH, SHIP_HEIGHT))
-        # Create a smaller version for lives display
-        self.life_image = pygame.transform.scale(pygame.image.load('sprites/ship.png'), (25, 15))
         self.destroyed = False
         # Power-up states
         self.double_shot = False
@@ -134,7 +186,7 @@ class Spaceship:
         self.power_up_timer = 0
         
     def reset_position(self):
-        self.x = (SCREEN_WIDTH - self.width) // 2
+        self.x = self.prev_x = (SCREEN_WIDTH - self.width) // 2
         self.y = SCREEN_HEIGHT - self.height - 10
         self.speed = SHIP_SPEED
         self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
@@ -161,83 +213,92 @@ class Spaceship:
             self.x = SCREEN_WIDTH - self.width
         self.rect.x = self.x
 
-    def draw(self, surface):
+    def draw(self, surface, alpha=1.0):
         # Flash during invulnerability by only drawing every other interval
         if not self.invulnerable or (self.respawn_timer // self.flash_interval) % 2 == 0:
-            surface.blit(self.image, (self.x, self.y))
+            return get_atlas().blit(surface, 'ship', (lerp(self.prev_x, self.x, alpha), self.y))
+        return None
 
 # Define the bullet class
 class Bullet:
-    def __init__(self, x, y):
+    __slots__ = ('width', 'height', 'x', 'y', 'prev_y', 'speed', 'rect', 'active')
+
+    def __init__(self, x=0, y=0):
         self.width = BULLET_WIDTH
         self.height = BULLET_HEIGHT
-        self.x = x
-        self.y = y
         self.speed = BULLET_SPEED
-        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
+        self.rect = pygame.Rect(x, y, self.width, self.height)
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        self.x = x
+        self.y = self.prev_y = y
         self.active = True
+        self.rect.x = x
+        self.rect.y = y
         
     def update(self):
+        self.prev_y = self.y
         self.y -= self.speed
         if self.y < 0:
             self.active = False
         self.rect.y = self.y
         
-    def draw(self, surface):
-        pygame.draw.rect(surface, BULLET_COLOR, self.rect)
+    def draw(self, surface, alpha=1.0):
+        if alpha >= 1.0:
+            return pygame.draw.rect(surface, BULLET_COLOR, self.rect)
+        return pygame.draw.rect(surface, BULLET_COLOR,
+                                (self.x, lerp(self.prev_y, self.y, alpha), self.width, self.height))
 
 # Define the enemy bullet class
 class EnemyBullet:
-    def __init__(self, x, y):
+    __slots__ = ('width', 'height', 'x', 'y', 'prev_y', 'speed', 'rect', 'active')
+
+    def __init__(self, x=0, y=0):
         self.width = ENEMY_BULLET_WIDTH
         self.height = ENEMY_BULLET_HEIGHT
-        self.x = x
-        self.y = y
         self.speed = ENEMY_BULLET_SPEED
-        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
+        self.rect = pygame.Rect(x, y, self.width, self.height)
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        self.x = x
+        self.y = self.prev_y = y
         self.active = True
+        self.rect.x = x
+        self.rect.y = y
 
     def update(self):
+        self.prev_y = self.y
         self.y += self.speed
         if self.y > SCREEN_HEIGHT:
             self.active = False
         self.rect.y = self.y
 
-    def draw(self, surface):
-        pygame.draw.rect(surface, ENEMY_BULLET_COLOR, self.rect)
-
-# Define the explosion class
-class Explosion:
-    def __init__(self, x, y, permanent=False):
-        self.image = pygame.transform.scale(pygame.image.load('sprites/explosion.png'), (50, 50))
-        self.x = x
-        self.y = y
-        self.duration = 20
-        self.frame = 0
-        self.active = True
-        self.permanent = permanent
-
-    def update(self):
-        if not self.permanent:
-            self.frame += 1
-            if self.frame >= self.duration:
-                self.active = False
-
-    def draw(self, surface):
-        surface.blit(self.image, (self.x, self.y))
+    def draw(self, surface, alpha=1.0):
+        if alpha >= 1.0:
+            return pygame.draw.rect(surface, ENEMY_BULLET_COLOR, self.rect)
+        return pygame.draw.rect(surface, ENEMY_BULLET_COLOR,
+                                (self.x, lerp(self.prev_y, self.y, alpha), self.width, self.height))
 
 # Define the UFO class
 class UFO:
-    def __init__(self, x, direction=1):
-        self.image = pygame.transform.scale(pygame.image.load('sprites/ufo.png'), (60, 30))
-        self.x = x
+    __slots__ = ('x', 'prev_x', 'y', 'direction', 'speed', 'rect', 'active')
+
+    def __init__(self, x=0, direction=1):
         self.y = 20  # fixed y-position near the top
-        self.direction = direction  # 1 for right, -1 for left
         self.speed = UFO_SPEED
-        self.rect = pygame.Rect(self.x, self.y, self.image.get_width(), self.image.get_height())
+        self.rect = pygame.Rect(x, self.y, UFO_WIDTH, UFO_HEIGHT)
+        self.reset(x, direction)
+
+    def reset(self, x, direction=1):
+        self.x = self.prev_x = x
+        self.direction = direction  # 1 for right, -1 for left
         self.active = True
+        self.rect.x = x
 
     def update(self):
+        self.prev_x = self.x
         self.x += self.speed * self.direction
         self.rect.x = self.x
         if self.direction == 1 and self.x > SCREEN_WIDTH:
@@ -245,242 +306,285 @@ class UFO:
         elif self.direction == -1 and self.x + self.rect.width < 0:
             self.active = False
 
-    def draw(self, surface):
-        surface.blit(self.image, (self.x, self.y))
+    def draw(self, surface, alpha=1.0):
+        return get_atlas().blit(surface, 'ufo', (lerp(self.prev_x, self.x, alpha), self.y))
 
-# Define the enemy class
-class Enemy:
-    def __init__(self, x, y):
-        self.width = ENEMY_WIDTH
-        self.height = ENEMY_HEIGHT
-        self.x = x
-        self.y = y
-        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
-        # Load and resize enemy images for animation
-        self.image_up = pygame.transform.scale(pygame.image.load('sprites/enemyUP.png'), (ENEMY_WIDTH, ENEMY_HEIGHT))
-        self.image_down = pygame.transform.scale(pygame.image.load('sprites/enemyDown.png'), (ENEMY_WIDTH, ENEMY_HEIGHT))
-        self.alive = True
-        self.animation_timer = 0
-        self.animation_interval = 20  # Adjust this value to control animation speed
-        self.use_up_image = True
-
-    def update(self, dx, dy):
-        self.x += dx
-        self.y += dy
-        self.rect.x = self.x
-        self.rect.y = self.y
-        
-        # Update animation
-        self.animation_timer += 1
-        if self.animation_timer >= self.animation_interval:
-            self.animation_timer = 0
-            self.use_up_image = not self.use_up_image
-
-    def draw(self, surface):
-        if self.alive:
-            current_image = self.image_up if self.use_up_image else self.image_down
-            surface.blit(current_image, (self.x, self.y))
-
-# Create enemy formation
-def create_enemies(rows, cols, x_offset=50, y_offset=50, padding=10):
-    enemies = []
-    for row in range(rows):
-        for col in range(cols):
-            x = x_offset + col * (ENEMY_WIDTH + padding)
-            y = y_offset + row * (ENEMY_HEIGHT + padding)
-            enemy = Enemy(x, y)
-            enemies.append(enemy)
-    return enemies
-
-# Main game loop
-def load_high_scores():
-    default_scores = [
-        {'name': 'CPU', 'score': 2000},
-        {'name': 'CPU', 'score': 1500},
-        {'name': 'CPU', 'score': 1000},
-        {'name': 'CPU', 'score': 500},
-        {'name': 'CPU', 'score': 250}
-    ]
-    
-    try:
-        with open('high_scores.json', 'r') as f:
-            return json.load(f)
-    except:
-        with open('high_scores.json', 'w') as f:
-            json.dump(default_scores, f)
-        return default_scores
+# Create the enemy formation, backed by NumPy arrays
+def create_formation(rows, cols, x_offset=50, y_offset=50, padding=10):
+    return Formation(rows, cols, ENEMY_WIDTH, ENEMY_HEIGHT, x_offset, y_offset, padding)
 
-def is_high_score(score):
-    scores = load_high_scores()
-    if len(scores) < 5:
-        return True
-    lowest_score = min(s['score'] for s in scores)
-    return score > lowest_score
+# Per-game balance settings. Defaults are read from the module constants
+# when the config is created, so tools can run many configurations side by
+# side without editing globals.
+class GameConfig:
+    FIELDS = ('enemy_speed', 'enemy_drop', 'enemy_shoot_prob', 'ufo_spawn_prob', 'ufo_shoot_prob',
+              'ufo_bonus_points', 'powerup_drop_chance', 'powerup_duration')
 
-def save_high_score(score, name):
-    scores = load_high_scores()
-    scores.append({'name': name, 'score': score})
-    # Sort by score (descending) and then by name
-    scores.sort(key=lambda x: (-x['score'], x['name']))
-    scores = scores[:5]  # Keep only top 5 scores
-    try:
-        with open('high_scores.json', 'w') as f:
-            json.dump(scores, f)
-    except Exception as e:
-        print(f'Error saving high score: {e}')
+    def __init__(self, **overrides):
+        self.enemy_speed = ENEMY_SPEED
+        self.enemy_drop = ENEMY_DROP
+        self.enemy_shoot_prob = ENEMY_SHOOT_PROB
+        self.ufo_spawn_prob = UFO_SPAWN_PROB
+        self.ufo_shoot_prob = UFO_SHOOT_PROB
+        self.ufo_bonus_points = UFO_BONUS_POINTS
+        self.powerup_drop_chance = POWERUP_DROP_CHANCE
+        self.powerup_duration = POWERUP_DURATION
+        for name, value in overrides.items():
+            if name not in self.FIELDS:
+                raise TypeError(f'unknown GameConfig setting: {name}')
+            setattr(self, name, value)
 
-def get_player_name(screen, font):
-    name = ''
-    input_active = True
-    input_rect = pygame.Rect(SCREEN_WIDTH//2 - 100, SCREEN_HEIGHT//2, 200, 32)
-    clock = pygame.time.Clock()
-    
-    while input_active:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    input_active = False
-                elif event.key == pygame.K_BACKSPACE:
-                    name = name[:-1]
-                else:
-                    if len(name) < 10:  # Limit name length
-                        if event.unicode.isalnum():  # Only allow letters and numbers
-                            name += event.unicode
-        
-        screen.fill(BLACK)
-        
-        # Draw prompt
-        prompt_text = font.render('New High Score! Enter Your Name:', True, WHITE)
-        screen.blit(prompt_text, (SCREEN_WIDTH//2 - prompt_text.get_width()//2, SCREEN_HEIGHT//2 - 50))
-        
-        # Draw input box
-        pygame.draw.rect(screen, WHITE, input_rect, 2)
-        
-        # Draw input text
-        text_surface = font.render(name, True, WHITE)
-        screen.blit(text_surface, (input_rect.x + 5, input_rect.y + 5))
-        
-        pygame.display.flip()
-        clock.tick(FPS)
-    
-    return name if name else 'Unknown'
-
-def main():
-    # Show the start screen
-    show_start_screen(screen)
-    running = True
-
-    spaceship = Spaceship()
-    player_bullets = []  # List to store player bullets
-    enemies = create_enemies(5, 10)
-    enemy_bullets = []
-    explosions = []
-    ufo = None
-    enemy_dx = ENEMY_SPEED
-    enemy_move_down = False
-
-    score = 0
-    font = pygame.font.SysFont(None, 36)
-    game_over = False
-    power_ups = []
-    high_scores = load_high_scores()
-    
-    def draw_lives(surface, ship):
-        # Draw lives in top-left corner
-        for i in range(ship.lives):
-            surface.blit(ship.life_image, (10 + i * 30, 40))
+    def replace(self, **changes):
+        return GameConfig(**{**self.as_dict(), **changes})
 
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return False  # Signal to quit the game
-            # Fire bullet when space is pressed and there's no active bullet
-            if event.type == pygame.KEYDOWN and not game_over:
-                if event.key == pygame.K_SPACE:
-                    active_bullets = len([b for b in player_bullets if b.active])
-                    max_bullets = 2 if spaceship.double_shot else 1
-                    
-                    if active_bullets < max_bullets:
-                        if spaceship.double_shot and active_bullets == 0:
-                            # Create two bullets side by side
-                            player_bullets.append(Bullet(spaceship.x + 10, spaceship.y))
-                            player_bullets.append(Bullet(spaceship.x + spaceship.width - 10, spaceship.y))
-                            shoot_sound.play()
-                        elif not spaceship.double_shot and active_bullets == 0:
-                            # Single bullet from the middle
-                            player_bullets.append(Bullet(spaceship.x + spaceship.width // 2 - BULLET_WIDTH // 2, spaceship.y))
-                            shoot_sound.play()
-            
-        keys = pygame.key.get_pressed()
-        if not game_over:
-            spaceship.update()
-            if not spaceship.destroyed:
-                if keys[pygame.K_LEFT]:
-                    spaceship.move(-1)
-                if keys[pygame.K_RIGHT]:
-                    spaceship.move(1)
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def __repr__(self):
+        return 'GameConfig(' + ', '.join(f'{k}={v!r}' for k, v in self.as_dict().items()) + ')'
+
+# Input bits passed to GameState.step
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_FIRE = 4
+
+# Game simulation, independent of the display, input devices and sound
+class GameState:
+    def __init__(self, rows=5, cols=10, seed=None, config=None):
+        # All randomness goes through this per-game generator, so a seed
+        # plus the per-frame inputs reproduce a game exactly
+        self.seed = random.randrange(2 ** 63) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.rows = rows
+        self.cols = cols
+        self.config = config or GameConfig()
+        self.spaceship = Spaceship()
+        self.player_bullets = Pool(Bullet, MAX_PLAYER_BULLETS)
+        self.formation = create_formation(rows, cols)
+        # Front-line shooters and the enemy shot schedule
+        self.fire_control = FireControl(self.formation, self.config.enemy_shoot_prob, self.rng)
+        self.enemy_bullets = Pool(EnemyBullet, MAX_ENEMY_BULLETS)
+        self.bunkers = Bunkers(SCREEN_WIDTH, BUNKER_TOP)
+        # Debris from every death; cosmetic, with its own generator
+        self.particles = ParticleSystem(bounds=(SCREEN_WIDTH, SCREEN_HEIGHT), seed=self.seed)
+        self.power_ups = Pool(PowerUp, MAX_POWERUPS)
+        self.ufo = None
+        self._spare_ufo = UFO()  # the one UFO instance, reused on every spawn
+        self.enemy_dx = self.config.enemy_speed
+        self.score = 0
+        self.game_over = False
+        # Why the game ended: 'shot', 'invaded' or 'cleared'
+        self.end_reason = None
+        self.frame = 0
+        # Sound names triggered during the last step, for the caller to play
+        self.events = []
+        # Pixel-accurate collision tests, counted per frame
+        self.narrow = NarrowPhase(FRAMES)
+        # Optional FrameProfiler; None keeps instrumentation free
+        self.profiler = None
+
+    def won(self):
+        return self.formation.all_dead()
+
+    def snapshot(self):
+        """Return an independent copy of the whole game, RNG state included."""
+        # Sprite surfaces are shared and immutable, so they are not copied,
+        # and the copy is not attached to this game's profiler
+        memo = sprites.shared_memo()
+        memo[id(self.profiler)] = None
+        return copy.deepcopy(self, memo)
+
+    def fire(self):
+        spaceship = self.spaceship
+        # Pools only hold live bullets, compacted at the end of every step
+        active_bullets = len(self.player_bullets)
+        max_bullets = 2 if spaceship.double_shot else 1
+
+        if active_bullets < max_bullets:
+            if spaceship.double_shot and active_bullets == 0:
+                # Create two bullets side by side
+                self.player_bullets.spawn(spaceship.x + 10, spaceship.y)
+                self.player_bullets.spawn(spaceship.x + spaceship.width - 10, spaceship.y)
+                self.events.append('shoot')
+            elif not spaceship.double_shot and active_bullets == 0:
+                # Single bullet from the middle
+                self.player_bullets.spawn(spaceship.x + spaceship.width // 2 - BULLET_WIDTH // 2, spaceship.y)
+                self.events.append('shoot')
+
+    # Collision queries and handlers used by the shared sweep
+    # Rect tests run first; only their hits go on to the pixel-mask test
+    def _enemy_target(self, rect):
+        return self.formation.hit_test(rect, self.narrow)
+
+    def _ufo_target(self, rect):
+        ufo = self.ufo
+        if ufo and rect.colliderect(ufo.rect) and self.narrow.rect_overlaps(rect, 'ufo', ufo.x, ufo.y):
+            return ufo
+        return None
+
+    def _ship_pickup_target(self, rect):
+        spaceship = self.spaceship
+        if (not spaceship.destroyed and rect.colliderect(spaceship.rect)
+                and self.narrow.rect_overlaps(rect, 'ship', spaceship.x, spaceship.y)):
+            return spaceship
+        return None
+
+    def _ship_target(self, rect):
+        spaceship = self.spaceship
+        if spaceship.invulnerable or spaceship.shield:
+            return None
+        return self._ship_pickup_target(rect)
+
+    def _hit_bunker(self, bullet, point):
+        self.bunkers.erode(*point)
+        bullet.active = False
+
+    def _hit_enemy(self, bullet, index):
+        formation = self.formation
+        formation.kill(index)
+        self.fire_control.on_kill(index)
+        bullet.active = False
+        self.score += 10
+        enemy_x, enemy_y = formation.position(index)
+        self.particles.burst('enemy', enemy_x + formation.width / 2, enemy_y + formation.height / 2)
+        self.events.append('explosion')
+
+        # Chance to drop power-up
+        if self.rng.random() < self.config.powerup_drop_chance:
+            power_type = self.rng.choice(['double_shot', 'shield'])
+            self.power_ups.spawn(enemy_x, enemy_y, power_type)
+
+    def _hit_ufo(self, bullet, ufo):
+        bullet.active = False
+        self.particles.burst('ufo', ufo.rect.centerx, ufo.rect.centery)
+        self.events.append('explosion')
+        self.score += self.config.ufo_bonus_points
+        self.ufo = None
+
+    def _collect_power_up(self, power_up, spaceship):
+        if power_up.type == 'double_shot':
+            spaceship.double_shot = True
+            spaceship.power_up_timer = self.config.powerup_duration
+        elif power_up.type == 'shield':
+            spaceship.shield = True
+            spaceship.power_up_timer = self.config.powerup_duration
+        power_up.active = False
+
+    def _hit_ship(self, eb, spaceship):
+        spaceship.destroyed = True
+        self.particles.burst('ship', spaceship.rect.centerx, spaceship.rect.centery)
+        self.events.append('explosion')
+        spaceship.lives -= 1
+        if spaceship.lives <= 0:
+            self.game_over = True
+            self.end_reason = 'shot'
+            self.events.append('game_over')
+        else:
+            spaceship.respawn()
+
+    def step(self, inputs=0):
+        """Advance the simulation by one frame.
+
+        `inputs` is a bitmask of INPUT_LEFT, INPUT_RIGHT and INPUT_FIRE.
+        Returns the list of sound events raised during the frame.
+        """
+        self.events.clear()
+        if self.game_over:
+            return self.events
+        self.frame += 1
+        self.narrow.begin_frame()
+        spaceship = self.spaceship
+        config = self.config
+        prof = self.profiler
+
+        if inputs & INPUT_FIRE:
+            self.fire()
+
+        spaceship.prev_x = spaceship.x
+        spaceship.update()
+        if not spaceship.destroyed:
+            if inputs & INPUT_LEFT:
+                spaceship.move(-1)
+            if inputs & INPUT_RIGHT:
+                spaceship.move(1)
+        if prof:
+            prof.lap('ship')
 
         # Enemy movement: check if any enemy will cross screen boundary in the next move
-        drop = False
-        for enemy in enemies:
-            if enemy.alive:
-                if (enemy.x + enemy_dx < 0) or (enemy.x + enemy.width + enemy_dx > SCREEN_WIDTH):
-                    drop = True
-                    break
-
-        if drop:
-            enemy_dx = -enemy_dx
-            for enemy in enemies:
-                if enemy.alive:
-                    enemy.update(0, ENEMY_DROP)
+        formation = self.formation
+        if formation.will_cross(self.enemy_dx, SCREEN_WIDTH):
+            self.enemy_dx = -self.enemy_dx
+            formation.march(0, config.enemy_drop)
         else:
-            for enemy in enemies:
-                if enemy.alive:
-                    enemy.update(enemy_dx, 0)
+            formation.march(self.enemy_dx, 0)
+        # Enemies that reach the bunkers wipe out whatever they overlap
+        bunkers = self.bunkers
+        if formation.reached(bunkers.rect.top):
+            overlapping = formation.alive & (formation.y < bunkers.rect.bottom) & (formation.y + formation.height > bunkers.rect.top)
+            for i in np.flatnonzero(overlapping):
+                bunkers.erase(formation.x[i], formation.y[i], formation.width, formation.height)
+        if prof:
+            prof.lap('formation')
 
-        # Update player bullets and check for collisions
-        for bullet in player_bullets:
+        # Move player bullets
+        for bullet in self.player_bullets:
             if bullet.active:
                 bullet.update()
-                # Check collision with enemies
-                for enemy in enemies:
-                    if enemy.alive and bullet.rect.colliderect(enemy.rect):
-                        enemy.alive = False
-                        bullet.active = False
-                        score += 10
-                        explosions.append(Explosion(enemy.x, enemy.y))
-                        explosion_sound.play()
-                        
-                        # Chance to drop power-up
-                        if random.random() < POWERUP_DROP_CHANCE:
-                            power_type = random.choice(['double_shot', 'shield'])
-                            power_ups.append(PowerUp(enemy.x, enemy.y, power_type))
-                        break
-        # Remove inactive bullets
-        player_bullets = [b for b in player_bullets if b.active]
-
-        # Check enemy bullet shooting: randomly let one alive enemy shoot
-        alive_enemies = [enemy for enemy in enemies if enemy.alive]
-        if alive_enemies and random.random() < ENEMY_SHOOT_PROB:
-            shooter = random.choice(alive_enemies)
-            enemy_bullets.append(EnemyBullet(shooter.x + shooter.width//2 - ENEMY_BULLET_WIDTH//2, shooter.y + shooter.height))
-
-        # Update power-ups
-        for power_up in power_ups:
+        if prof:
+            prof.lap('projectiles')
+
+        # Enemy fire: a front-line enemy shoots when its scheduled shot comes due
+        shooter = self.fire_control.tick()
+        if shooter is not None:
+            shooter_x, shooter_y = formation.position(shooter)
+            self.enemy_bullets.spawn(shooter_x + formation.width//2 - ENEMY_BULLET_WIDTH//2, shooter_y + formation.height)
+        if prof:
+            prof.lap('enemy_fire')
+
+        # Move power-ups and enemy bullets
+        for power_up in self.power_ups:
             if power_up.active:
                 power_up.update()
-                if not spaceship.destroyed and power_up.rect.colliderect(spaceship.rect):
-                    if power_up.type == 'double_shot':
-                        spaceship.double_shot = True
-                        spaceship.power_up_timer = POWERUP_DURATION
-                    elif power_up.type == 'shield':
-                        spaceship.shield = True
-                        spaceship.power_up_timer = POWERUP_DURATION
-                    power_up.active = False
-        power_ups = [p for p in power_ups if p.active]
+        for eb in self.enemy_bullets:
+            if eb.active:
+                eb.update()
+        if prof:
+            prof.lap('projectiles')
+
+        # Spawn and update UFO
+        if not self.ufo and self.rng.random() < config.ufo_spawn_prob:
+            direction = self.rng.choice([1, -1])
+            self.ufo = self._spare_ufo
+            if direction == 1:
+                self.ufo.reset(-60, direction)  # start off-screen left
+            else:
+                self.ufo.reset(SCREEN_WIDTH, direction)  # start off-screen right
+            self.events.append('ufo')
+        if self.ufo:
+            ufo = self.ufo
+            ufo.update()
+            if not ufo.active:
+                self.ufo = None
+            # UFO shooting bullets
+            elif self.rng.random() < config.ufo_shoot_prob:
+                self.enemy_bullets.spawn(ufo.x + ufo.rect.width//2 - ENEMY_BULLET_WIDTH//2, ufo.y + ufo.rect.height)
+        if prof:
+            prof.lap('ufo')
+
+        # One collision pass for every projectile type; bunkers shield both sides
+        sweep(self.player_bullets, bunkers.hit_from_below, self._hit_bunker)
+        sweep(self.player_bullets, self._enemy_target, self._hit_enemy)
+        sweep(self.player_bullets, self._ufo_target, self._hit_ufo)
+        sweep(self.power_ups, self._ship_pickup_target, self._collect_power_up)
+        sweep(self.enemy_bullets, bunkers.hit_from_above, self._hit_bunker)
+        sweep(self.enemy_bullets, self._ship_target, self._hit_ship)
+
+        # Recycle inactive projectiles in place
+        self.player_bullets.compact()
+        self.power_ups.compact()
+        self.enemy_bullets.compact()
+        if prof:
+            prof.lap('collisions')
 
         # Update power-up timer
         if spaceship.power_up_timer > 0:
@@ -488,168 +592,446 @@ def main():
             if spaceship.power_up_timer <= 0:
                 spaceship.double_shot = False
                 spaceship.shield = False
+        if prof:
+            prof.lap('power_ups')
 
-        # Update enemy bullets and check collision with spaceship
-        for eb in enemy_bullets:
-            if eb.active:
-                eb.update()
-                if not spaceship.destroyed and not spaceship.invulnerable and not spaceship.shield and eb.rect.colliderect(spaceship.rect):
-                    spaceship.destroyed = True
-                    explosions.append(Explosion(spaceship.x, spaceship.y))
-                    explosion_sound.play()
-                    spaceship.lives -= 1
-                    if spaceship.lives <= 0:
-                        game_over = True
-                        game_over_sound.play()
-                    else:
-                        spaceship.respawn()
-        enemy_bullets = [eb for eb in enemy_bullets if eb.active]
+        self.particles.update()
 
-        # Spawn and update UFO
-        if not ufo and random.random() < UFO_SPAWN_PROB:
-            direction = random.choice([1, -1])
-            if direction == 1:
-                ufo = UFO(-60, direction)  # start off-screen left
+        # Check for game over: if any enemy reaches close to spaceship
+        if not self.game_over and formation.reached(spaceship.y):
+            self.game_over = True
+            self.end_reason = 'invaded'
+        if not self.game_over and self.won() and self.ufo is None:
+            self.game_over = True
+            self.end_reason = 'cleared'
+        if prof:
+            prof.lap('particles')
+
+        return self.events
+
+# Draw the current game state; rendering only observes the simulation
+def draw_scene(surface, state, font, clear=True, profiler=None, alpha=1.0):
+    """Draw the game and return the rects of everything drawn.
+
+    With clear=False the caller is responsible for erasing the previous
+    frame, as the dirty-rectangle renderer does. `alpha` in [0, 1] places
+    moving sprites between the previous and the latest simulation step.
+    """
+    spaceship = state.spaceship
+    drawn = []
+    if clear:
+        surface.fill(BLACK)
+    if not spaceship.destroyed:
+        drawn.append(spaceship.draw(surface, alpha))
+    drawn.extend(state.bunkers.draw(surface))
+    # Draw player bullets
+    for bullet in state.player_bullets:
+        if bullet.active:
+            drawn.append(bullet.draw(surface, alpha))
+    atlas = get_atlas()
+    drawn.extend(state.formation.draw(surface, atlas, alpha))
+    # Draw enemy bullets
+    for eb in state.enemy_bullets:
+        if eb.active:
+            drawn.append(eb.draw(surface, alpha))
+    # Draw UFO if it exists
+    if state.ufo:
+        drawn.append(state.ufo.draw(surface, alpha))
+    # Draw explosion debris, all particles in one batch
+    drawn.extend(state.particles.draw(surface, alpha))
+
+    if profiler:
+        profiler.lap('draw')
+
+    # Display score and draw lives in top-left corner
+    score_text = render_text(font, f"Score: {state.score}", WHITE)
+    drawn.append(surface.blit(score_text, (10, 10)))
+    for i in range(spaceship.lives):
+        drawn.append(atlas.blit(surface, 'life', (10 + i * 30, 40)))
+
+    # Draw power-ups
+    for power_up in state.power_ups:
+        drawn.append(power_up.draw(surface, alpha))
+
+    # Display active power-ups
+    if spaceship.double_shot:
+        power_text = render_text(font, 'Double Shot!', (255, 255, 0))
+        drawn.append(surface.blit(power_text, (SCREEN_WIDTH - 150, 10)))
+    if spaceship.shield:
+        shield_text = render_text(font, 'Shield!', (0, 255, 255))
+        drawn.append(surface.blit(shield_text, (SCREEN_WIDTH - 150, 40)))
+    if profiler:
+        profiler.lap('hud')
+    return drawn
+
+# The game-over overlay, score table and prompt are cached compositor layers
+_screen_layers = None
+# Top of the restart prompt, as laid out by the last render_game_over()
+_prompt_top = None
+
+def get_screen_layers():
+    global _screen_layers
+    if _screen_layers is None:
+        _screen_layers = Compositor((SCREEN_WIDTH, SCREEN_HEIGHT))
+    return _screen_layers
+
+def render_game_over(layer, won, score, table, font):
+    """Draw the overlay, result and score table; returns the y for the prompt below them."""
+    # Semi-transparent overlay, 200/255 opacity
+    layer.fill((0, 0, 0, 200))
+
+    # Draw game over content
+    y_offset = SCREEN_HEIGHT // 2 - 100
+    msg = 'You Win!' if won else 'Game Over!'
+    game_over_text = render_text(font, msg, WHITE)
+    layer.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, y_offset))
+
+    # Display score
+    y_offset += 40
+    final_score_text = render_text(font, f'Final Score: {score}', WHITE)
+    layer.blit(final_score_text, (SCREEN_WIDTH // 2 - final_score_text.get_width() // 2, y_offset))
+
+    # Display high scores
+    y_offset += 50
+    high_score_text = render_text(font, 'High Scores:', WHITE)
+    layer.blit(high_score_text, (SCREEN_WIDTH // 2 - high_score_text.get_width() // 2, y_offset))
+
+    for i, (name, hs_score) in enumerate(table):
+        y_offset += 30
+        score_text = render_text(font, f'{i+1}. {name}: {hs_score}', WHITE)
+        layer.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, y_offset))
+    return y_offset + 50
+
+def draw_game_over(surface, state, font, high_scores, prompt=True):
+    """Draw the game-over overlay, score table and restart prompt over `surface`.
+
+    The layers are rebuilt only when the result or the table changes, so
+    drawing them again costs two blits. Returns the rects drawn.
+    """
+    layers = get_screen_layers()
+    won = state.won()
+    table = tuple((hs['name'], hs['score']) for hs in high_scores[:5])
+
+    def render_overlay(layer):
+        global _prompt_top
+        _prompt_top = render_game_over(layer, won, state.score, table, font)
+
+    layers.update('overlay', ('game_over', won, state.score, table, font), render_overlay)
+
+    # Display restart/quit instructions below the table
+    restart_text = render_text(font, 'Press SPACE to Play Again or ESC to Quit', WHITE)
+    prompt_rect = pygame.Rect(SCREEN_WIDTH // 2 - restart_text.get_width() // 2, _prompt_top, *restart_text.get_size())
+    layers.update('hud', ('restart', font), lambda layer: layer.blit(restart_text, (0, 0)), rect=prompt_rect)
+    layers.set_visible('hud', prompt)
+    return layers.compose(surface, ('overlay', 'hud'))
+
+def game_over_frame(state, font, high_scores):
+    """Return the IdleScreen draw(surface, tick) callback of the game-over screen."""
+    layers = get_screen_layers()
+    layers.invalidate('background')
+
+    def draw(surface, tick):
+        layers.update('background', 'scene', lambda layer: draw_scene(layer, state, font))
+        layers.compose(surface, ('background',))
+        draw_game_over(surface, state, font, high_scores, prompt=tick % 2 == 0)
+
+    return draw
+
+def show_game_over_screen(screen, state, font):
+    """Wait on the game-over screen; returns True to play again.
+
+    The final scene is kept as the compositor's background layer and the
+    overlay is cached, so each blink of the prompt is just three blits,
+    and the loop sleeps in between.
+    """
+    draw = game_over_frame(state, font, load_high_scores())
+
+    def handle(event):
+        if event.type == pygame.QUIT:
+            return False
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SPACE:
+                return True  # Restart game
+            elif event.key == pygame.K_ESCAPE:
+                return False  # Quit game
+        return None
+
+    return IdleScreen(screen, draw, handle).run()
+
+# High scores live in a local SQLite leaderboard; the functions below are
+# the original top-5 API on top of it. The legacy JSON table is imported
+# the first time the database is created.
+_high_score_store = None
+
+def get_high_score_store():
+    global _high_score_store
+    if _high_score_store is None:
+        _high_score_store = SQLiteLeaderboard('high_scores.db', import_json='high_scores.json')
+    return _high_score_store
+
+def load_high_scores():
+    return get_high_score_store().scores()
+
+def is_high_score(score):
+    return get_high_score_store().is_high_score(score)
+
+def save_high_score(score, name):
+    get_high_score_store().add(score, name)
+
+def get_player_name(screen, font):
+    """Ask for the player's name; the screen is redrawn only on a keypress or cursor blink."""
+    name = ''
+    input_rect = pygame.Rect(SCREEN_WIDTH//2 - 100, SCREEN_HEIGHT//2, 200, 32)
+
+    def draw(surface, tick):
+        surface.fill(BLACK)
+
+        # Draw prompt
+        prompt_text = render_text(font, 'New High Score! Enter Your Name:', WHITE)
+        surface.blit(prompt_text, (SCREEN_WIDTH//2 - prompt_text.get_width()//2, SCREEN_HEIGHT//2 - 50))
+
+        # Draw input box
+        pygame.draw.rect(surface, WHITE, input_rect, 2)
+
+        # Draw input text with a blinking cursor
+        text_surface = render_text(font, name, WHITE)
+        surface.blit(text_surface, (input_rect.x + 5, input_rect.y + 5))
+        if tick % 2 == 0:
+            cursor_x = input_rect.x + 7 + text_surface.get_width()
+            pygame.draw.line(surface, WHITE, (cursor_x, input_rect.y + 6), (cursor_x, input_rect.bottom - 6), 2)
+
+    def handle(event):
+        nonlocal name
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            sys.exit()
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_RETURN:
+                return name if name else 'Unknown'
+            elif event.key == pygame.K_BACKSPACE:
+                name = name[:-1]
             else:
-                ufo = UFO(SCREEN_WIDTH, direction)  # start off-screen right
-            ufo_sound.play()
-        if ufo:
-            ufo.update()
+                if len(name) < 10:  # Limit name length
+                    if event.unicode.isalnum():  # Only allow letters and numbers
+                        name += event.unicode
+            return REDRAW
+        return None
 
-            # UFO shooting bullets
-            if random.random() < UFO_SHOOT_PROB:
-                enemy_bullets.append(EnemyBullet(ufo.x + ufo.rect.width//2 - ENEMY_BULLET_WIDTH//2, ufo.y + ufo.rect.height))
-
-            # Check collision with player bullets
-            for bullet in player_bullets:
-                if bullet.active and bullet.rect.colliderect(ufo.rect):
-                    bullet.active = False
-                    explosions.append(Explosion(ufo.x, ufo.y))
-                    explosion_sound.play()
-                    score += UFO_BONUS_POINTS
-                    ufo = None
-                    break
-            if ufo and not ufo.active:
-                ufo = None
-
-        # Update explosions and remove inactive ones
-        for exp in explosions:
-            exp.update()
-        explosions = [exp for exp in explosions if exp.active]
+    return IdleScreen(screen, draw, handle).run()
 
-        # Check for game over: if any enemy reaches close to spaceship
-        for enemy in enemies:
-            if enemy.alive and enemy.y + enemy.height >= spaceship.y:
-                game_over = True
-                break
-        if all(not enemy.alive for enemy in enemies) and ufo is None:
-            game_over = True
+def load_sounds():
+    # Runs on the loader thread, after init_audio() has opened the mixer
+    # Sounds whose WAV is out of date with its generator are synthesized instead
+    sounds = synthesize_sounds(load=load_sound)
+    for name, (_, volume) in SOUND_FILES.items():
+        sounds[name].set_volume(volume)
+    return sounds
 
-        # Draw everything
-        screen.fill(BLACK)
-        if not spaceship.destroyed:
-            spaceship.draw(screen)
-        # Draw player bullets
-        for bullet in player_bullets:
-            if bullet.active:
-                bullet.draw(screen)
-        for enemy in enemies:
-            if enemy.alive:
-                enemy.draw(screen)
-        # Draw enemy bullets
-        for eb in enemy_bullets:
-            if eb.active:
-                eb.draw(screen)
-        # Draw UFO if it exists
-        if ufo:
-            ufo.draw(screen)
-        # Draw explosions
-        for exp in explosions:
-            exp.draw(screen)
-
-        # Display score and draw lives
-        score_text = font.render(f"Score: {score}", True, WHITE)
-        screen.blit(score_text, (10, 10))
-        draw_lives(screen, spaceship)
-
-        # Draw power-ups
-        for power_up in power_ups:
-            power_up.draw(screen)
-
-        # Display active power-ups
-        if spaceship.double_shot:
-            power_text = font.render('Double Shot!', True, (255, 255, 0))
-            screen.blit(power_text, (SCREEN_WIDTH - 150, 10))
-        if spaceship.shield:
-            shield_text = font.render('Shield!', True, (0, 255, 255))
-            screen.blit(shield_text, (SCREEN_WIDTH - 150, 40))
-
-        # Create overlay surface for game over
-        if game_over:
+def preload_sprites():
+    # Decode only; scaling and conversion happen on the main thread
+    for path, _ in FRAMES.values():
+        sprites.preload(path)
+
+# Fonts are created on the main thread, once per (name, size), and reused
+# across games so their rendered text stays cached
+_fonts = {}
+
+def get_font(name, size):
+    font = _fonts.get((name, size))
+    if font is None:
+        font = _fonts[(name, size)] = pygame.font.SysFont(name, size)
+    return font
+
+def init_audio():
+    """Open the mixer; returns False, and the game runs silent, without an audio device."""
+    try:
+        pygame.mixer.init()
+    except pygame.error as e:
+        STARTUP.mark('mixer', f'failed: {e}')
+        return False
+    STARTUP.mark('mixer')
+    return True
+
+def init_display(vsync=False):
+    """Open the window and start the clock; safe to call more than once."""
+    global screen, clock
+    if screen is None:
+        pygame.display.init()
+        pygame.font.init()
+        if vsync:
+            # pygame only honours vsync on a SCALED or OpenGL display
+            try:
+                screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SCALED, vsync=1)
+            except pygame.error as e:
+                print(f'vsync unavailable ({e}); using a regular window')
+        if screen is None:
+            screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption('Space Invaders')
+        clock = pygame.time.Clock()
+        STARTUP.mark('display')
+    return screen
+
+def init(vsync=False):
+    """Open the window and start loading the remaining assets in the background.
+
+    SDL subsystems are opened here, on the main thread; the loader thread
+    only reads and decodes files.
+    """
+    global _loader
+    init_display(vsync)
+    if _loader is None:
+        tasks = [('sprites', preload_sprites)]
+        if init_audio():
+            tasks.insert(0, ('sounds', load_sounds))
+        _loader = BackgroundLoader(tasks, STARTUP).start()
+    return screen
+
+def finish_loading():
+    """Wait for the background loader, then print the startup report (first call only)."""
+    global _ready
+    if _ready or _loader is None:
+        return
+    waited = time.perf_counter()
+    _loader.wait()
+    SOUNDS.update(_loader.results.get('sounds', {}))
+    get_atlas()
+    _ready = True
+    STARTUP.mark('ready', f'waited {(time.perf_counter() - waited) * 1000.0:.1f} ms after the intro')
+    print(STARTUP.format())
+
+def main(dirty_rects=DIRTY_RECTS, seed=None, record=None, profiler=None, max_fps=FPS, vsync=False):
+    """Play one game; returns True to play again.
+
+    The simulation always advances in fixed 1/FPS steps, as many per frame
+    as real time requires. Rendering runs at up to `max_fps` frames per
+    second (0 for uncapped, e.g. with vsync pacing the flips) and
+    interpolates between the last two steps.
+    """
+    init(vsync)
+    # Show the start screen while the rest loads
+    show_start_screen(screen, STARTUP)
+    finish_loading()
+
+    state = GameState(seed=seed)
+    # Optionally log every frame's inputs so the game can be replayed
+    recorder = ReplayRecorder(state) if record else None
+    font = get_font(None, 36)
+    # Push only changed screen areas instead of flipping the whole display
+    renderer = DirtyRenderer(screen) if dirty_rects else None
+    # Per-phase timings; F3 toggles the overlay, creating a profiler if needed
+    state.profiler = profiler
+    overlay_font = get_font('monospace', 14)
+    step_ms = 1000.0 / FPS
+    accumulator = 0.0
+    fire = False
+    clock.tick()  # the intro screen is not part of the first frame
+
+    while True:
+        if profiler:
+            profiler.begin_frame()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False  # Signal to quit the game
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    if profiler is None:
+                        profiler = state.profiler = FrameProfiler()
+                        profiler.begin_frame()
+                    profiler.toggle_overlay()
+                    if renderer:
+                        renderer.invalidate()
+                elif event.key == pygame.K_SPACE:
+                    # Fire bullet when space is pressed; kept until a step runs
+                    fire = True
+
+        held = 0
+        keys = pygame.key.get_pressed()
+        if keys[pygame.K_LEFT]:
+            held |= INPUT_LEFT
+        if keys[pygame.K_RIGHT]:
+            held |= INPUT_RIGHT
+        if profiler:
+            profiler.lap('events')
+
+        # Run as many fixed steps as real time has accumulated
+        steps = 0
+        while accumulator >= step_ms and steps < MAX_STEPS_PER_FRAME:
+            inputs = held | INPUT_FIRE if fire else held
+            fire = False
+            for sound_name in (recorder or state).step(inputs):
+                sound = SOUNDS.get(sound_name)  # absent without an audio device
+                if sound:
+                    sound.play()
+            accumulator -= step_ms
+            steps += 1
+        if accumulator >= step_ms:
+            # Too far behind to catch up: drop the backlog instead
+            accumulator %= step_ms
+        alpha = accumulator / step_ms
+
+        if state.game_over:
             # Handle high score first
-            if not hasattr(spaceship, 'name_entered'):
-                if is_high_score(score):
-                    # Clear any remaining events before name input
-                    pygame.event.clear()
-                    player_name = get_player_name(screen, font)
-                    save_high_score(score, player_name)
-                spaceship.name_entered = True
-            
-            # Create semi-transparent overlay
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            overlay.fill((0, 0, 0))
-            overlay.set_alpha(200)  # 200/255 opacity
-            screen.blit(overlay, (0, 0))
-            
-            # Draw game over content
-            y_offset = SCREEN_HEIGHT // 2 - 100
-            msg = 'You Win!' if all(not enemy.alive for enemy in enemies) else 'Game Over!'
-            game_over_text = font.render(msg, True, WHITE)
-            screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, y_offset))
-            
-            # Display score
-            y_offset += 40
-            final_score_text = font.render(f'Final Score: {score}', True, WHITE)
-            screen.blit(final_score_text, (SCREEN_WIDTH // 2 - final_score_text.get_width() // 2, y_offset))
-            
-            # Display high scores
-            y_offset += 50
-            high_score_text = font.render('High Scores:', True, WHITE)
-            screen.blit(high_score_text, (SCREEN_WIDTH // 2 - high_score_text.get_width() // 2, y_offset))
-            
-            # Load fresh high scores each frame in case they changed
-            high_scores = load_high_scores()
-            for i, hs in enumerate(high_scores[:5]):
-                y_offset += 30
-                score_text = font.render(f'{i+1}. {hs["name"]}: {hs["score"]}', True, WHITE)
-                screen.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, y_offset))
-            
-            # Display restart/quit instructions
-            y_offset += 50
-            restart_text = font.render('Press SPACE to Play Again or ESC to Quit', True, WHITE)
-            screen.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, y_offset))
-            
-            # Handle input events for game over
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return False
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE:
-                        return True  # Restart game
-                    elif event.key == pygame.K_ESCAPE:
-                        return False  # Quit game
-
-        pygame.display.flip()
-        clock.tick(FPS)
+            if is_high_score(state.score):
+                # Clear any remaining events before name input
+                pygame.event.clear()
+                player_name = get_player_name(screen, font)
+                save_high_score(state.score, player_name)
+            if recorder:
+                recorder.save(record)
+            if profiler:
+                profiler.end_frame()
+            # Waiting screens idle until there is input
+            return show_game_over_screen(screen, state, font)
+
+        # Draw everything
+        if renderer:
+            renderer.begin()
+            renderer.extend(draw_scene(screen, state, font, clear=False, profiler=profiler, alpha=alpha))
+        else:
+            draw_scene(screen, state, font, profiler=profiler, alpha=alpha)
+
+        if profiler:
+            overlay_rects = profiler.draw_overlay(screen, overlay_font, render_text)
+            if renderer:
+                renderer.extend(overlay_rects)
+
+        if renderer:
+            renderer.present()
+        else:
+            pygame.display.flip()
+        if profiler:
+            profiler.lap('flip')
+            profiler.end_frame()
+        accumulator += clock.tick(max_fps)
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Space Invaders')
+    parser.add_argument('--full-flip', action='store_true',
+                        help='redraw and flip the whole screen every frame')
+    parser.add_argument('--seed', type=int, help='seed for the game RNG (random by default)')
+    parser.add_argument('--record', metavar='PATH', help='save a replay of the latest game to PATH')
+    parser.add_argument('--profile', metavar='PATH',
+                        help='time each main loop phase and export to PATH (.csv or .json) on exit')
+    parser.add_argument('--max-fps', type=int, default=FPS,
+                        help=f'render frame rate cap (default {FPS}); the game itself always runs at {FPS} steps/sec')
+    parser.add_argument('--uncapped', action='store_true', help='render as fast as possible')
+    parser.add_argument('--vsync', action='store_true', help='pace rendering by the display refresh')
+    args = parser.parse_args()
+    profiler = FrameProfiler() if args.profile else None
+    max_fps = 0 if args.uncapped or args.vsync else args.max_fps
+
     while True:
         try:
-            if not main():  # If main returns False, quit the game
+            if not main(dirty_rects=not args.full_flip, seed=args.seed, record=args.record, profiler=profiler,
+                        max_fps=max_fps, vsync=args.vsync):  # If main returns False, quit the game
                 break
         except Exception as e:
             print(f"Error: {e}")
             break
     
+    if _high_score_store is not None:
+        _high_score_store.flush()
+    if profiler:
+        profiler.export(args.profile)
     pygame.quit()
     sys.exit()
@@ -0,0 +1,74 @@
+import math
+
+
+class SpatialGrid:
+    """Uniform grid of buckets for broad-phase collision queries.
+
+    Items are stored relative to a movable origin, so translating everything
+    in the grid at once (a formation march or drop) is a single O(1) update
+    of the origin rather than a re-bucketing of every item.
+    """
+
+    def __init__(self, cell_width, cell_height, origin_x=0, origin_y=0):
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.cells = {}       # (cell_x, cell_y) -> list of keys
+        self._item_cells = {}  # key -> list of cells the item was put in
+
+    def __len__(self):
+        return len(self._item_cells)
+
+    def _cell_span(self, left, top, right, bottom):
+        """Return the cell ranges covering the half-open box [left, right) x [top, bottom)."""
+        left -= self.origin_x
+        right -= self.origin_x
+        top -= self.origin_y
+        bottom -= self.origin_y
+        return (range(math.floor(left / self.cell_width), math.ceil(right / self.cell_width)),
+                range(math.floor(top / self.cell_height), math.ceil(bottom / self.cell_height)))
+
+    def insert(self, key, x, y, width, height):
+        columns, rows = self._cell_span(x, y, x + width, y + height)
+        cells = [(cx, cy) for cx in columns for cy in rows]
+        for cell in cells:
+            self.cells.setdefault(cell, []).append(key)
+        self._item_cells[key] = cells
+
+    def remove(self, key):
+        for cell in self._item_cells.pop(key, ()):
+            bucket = self.cells[cell]
+            bucket.remove(key)
+            if not bucket:
+                del self.cells[cell]
+
+    def translate(self, dx, dy):
+        self.origin_x += dx
+        self.origin_y += dy
+
+    def query(self, rect):
+        """Return the keys bucketed in any cell that `rect` overlaps."""
+        columns, rows = self._cell_span(rect.left, rect.top, rect.right, rect.bottom)
+        found = []
+        cells = self.cells
+        for cx in columns:
+            for cy in rows:
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.extend(bucket)
+        return found
+
+
+def sweep(projectiles, query, on_hit):
+    """Shared collision pass for every projectile type.
+
+    Each active projectile's rect is passed to `query`, which returns the
+    target it hits or None. Hits are reported as on_hit(projectile, target);
+    the handler is responsible for deactivating the projectile.
+    """
+    for projectile in projectiles:
+        if projectile.active:
+            target = query(projectile.rect)
+            if target is not None:
+                on_hit(projectile, target)
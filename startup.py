@@ -0,0 +1,71 @@
+"""Cold-start helpers: a startup timing report and a background loader.
+
+The game opens its window and mixer and shows the intro screen first, and
+reads and decodes the rest (sounds, sprite images) on a background thread
+while the player is looking at it. SDL, mixer and font objects are only
+initialized or created on the main thread.
+"""
+import threading
+import time
+
+
+class StartupReport:
+    """Milestones of a cold start, timed from when the report was created."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.marks = []
+        self._lock = threading.Lock()
+
+    def mark(self, name, note=''):
+        with self._lock:
+            self.marks.append((name, (time.perf_counter() - self.start) * 1000.0, note))
+
+    def elapsed(self, name):
+        """Return the time in ms at which `name` was marked, or None."""
+        for mark, ms, _ in self.marks:
+            if mark == name:
+                return ms
+        return None
+
+    def format(self):
+        lines = ['Startup timings (ms since import):']
+        for name, ms, note in self.marks:
+            lines.append(f'  {name:<16} {ms:8.1f}' + (f'  {note}' if note else ''))
+        return '\n'.join(lines)
+
+
+class BackgroundLoader:
+    """Run named loading tasks, in order, on a daemon thread.
+
+    A task that raises is recorded in `errors` instead of stopping the rest,
+    so an unreadable asset does not prevent the game from starting.
+    """
+
+    def __init__(self, tasks, report=None):
+        self.tasks = tasks
+        self.report = report
+        self.results = {}
+        self.errors = {}
+        self._thread = threading.Thread(target=self._run, name='asset-loader', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        for name, task in self.tasks:
+            try:
+                self.results[name] = task()
+            except Exception as e:
+                self.errors[name] = e
+            if self.report:
+                self.report.mark(name, 'background' + (f', failed: {self.errors[name]}' if name in self.errors else ''))
+
+    def done(self):
+        return not self._thread.is_alive()
+
+    def wait(self):
+        """Block until every task has run and return the results."""
+        self._thread.join()
+        return self.results
@@ -0,0 +1,48 @@
+from collections import OrderedDict
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (font, text, color).
+
+    Only strings that actually change (a new score, a new name) are
+    rasterized; everything else is a dictionary lookup. The least recently
+    used surfaces are evicted once `max_entries` is exceeded.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._surfaces)}
+
+    def clear(self):
+        self._surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# Shared cache used by the HUD, menus and high-score table
+text_cache = TextCache()
+
+
+def render_text(font, text, color):
+    """Return the cached antialiased surface for `text` in `font` and `color`."""
+    return text_cache.render(font, text, color)